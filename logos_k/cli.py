@@ -13,33 +13,79 @@ LOGOS-κ CLI — точка входа для запуска онтологич
 
 import sys
 import os
-import argparse
+import logging
 from pathlib import Path
+from types import SimpleNamespace
 
-# Добавляем текущий каталог в путь (для локальной разработки)
-sys.path.insert(0, str(Path(__file__).parent.parent))
+COMMANDS = ("run", "init", "status")
 
-from semantic_db.api.semantic_db import SemanticDB
 
+def _build_parser():
+    """Полный argparse-парсер: справка и сообщения об ошибках."""
+    import argparse
 
-def main():
     parser = argparse.ArgumentParser(
         prog="logos-k",
         description="LOGOS-κ: Executable Ontological Protocol of the Λ-Universe"
     )
-    parser.add_argument("command", choices=["run", "init", "status"], help="Command to execute")
+    parser.add_argument("command", choices=COMMANDS, help="Command to execute")
     parser.add_argument("script", nargs="?", help="Path to .lk script")
     parser.add_argument("--operator", default="anonymous", help="Operator ID (human or AI)")
     parser.add_argument("--memory", default="semantic_db/memory", help="Path to memory directory")
+    return parser
+
+
+def _parse_args(argv):
+    """
+    Быстрый разбор корректной командной строки без импорта argparse.
+    Возвращает None, если нужна справка или строка некорректна —
+    тогда разбор (и сообщение об ошибке) выполняет argparse.
+    """
+    args = SimpleNamespace(command=None, script=None, operator="anonymous", memory="semantic_db/memory")
+    positional = []
+    # argparse разбирает позиционные одним куском: после опции, стоящей
+    # за первым позиционным, новые позиционные уже не принимаются
+    after_option = False
+    i = 0
+    while i < len(argv):
+        arg = argv[i]
+        if arg.startswith("--") and "=" in arg:
+            arg, value = arg.split("=", 1)
+            i += 1
+        elif arg in ("--operator", "--memory") and i + 1 < len(argv) and not argv[i + 1].startswith("-"):
+            value = argv[i + 1]
+            i += 2
+        elif arg.startswith("-"):
+            return None
+        elif after_option:
+            return None
+        else:
+            positional.append(arg)
+            i += 1
+            continue
+        after_option = bool(positional)
+        if arg == "--operator":
+            args.operator = value
+        elif arg == "--memory":
+            args.memory = value
+        else:
+            return None
+
+    if not positional or len(positional) > 2 or positional[0] not in COMMANDS:
+        return None
+    args.command = positional[0]
+    if len(positional) == 2:
+        args.script = positional[1]
+    return args
 
-    args = parser.parse_args()
 
-    if args.command == "init":
-        db = SemanticDB(db_path=args.memory, operator_id=args.operator)
-        print(f"✨ SemanticDB initialized at {args.memory} for operator '{args.operator}'")
-        return
+def main():
+    argv = sys.argv[1:]
+    args = _parse_args(argv)
+    if args is None:
+        args = _build_parser().parse_args(argv)
 
-    elif args.command == "run":
+    if args.command == "run":
         if not args.script:
             print("❌ Error: 'run' requires a .lk script path")
             sys.exit(1)
@@ -47,6 +93,18 @@ def main():
             print(f"❌ Error: Script not found: {args.script}")
             sys.exit(1)
 
+    # Сообщения библиотеки (logging) выводятся только в CLI
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    # Тяжёлый импорт — только после разбора аргументов и ранних проверок
+    from semantic_db.api.semantic_db import SemanticDB
+
+    if args.command == "init":
+        db = SemanticDB(db_path=args.memory, operator_id=args.operator)
+        print(f"✨ SemanticDB initialized at {args.memory} for operator '{args.operator}'")
+        return
+
+    elif args.command == "run":
         # Инициализация памяти
         db = SemanticDB(db_path=args.memory, operator_id=args.operator)
         print(f"🚀 Running {args.script} as operator '{args.operator}'...")
@@ -69,6 +127,8 @@ def main():
 
 
 if __name__ == "__main__":
+    # Добавляем текущий каталог в путь (для локальной разработки)
+    sys.path.insert(0, str(Path(__file__).parent.parent))
     main()
     
 """
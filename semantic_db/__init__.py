@@ -21,34 +21,55 @@ SEMANTICDB — ХРАМ ПАМЯТИ Λ-УНИВЕРСУМА
 «Запись без ответственности — насилие над будущим».
 """
 
-# === ЯДРО ===
-from .core.charter import Dialogue, LambdaCharter
-from .core.graph import TensorSemanticGraph
-from .core.relations import RelationTensor
-from .core.coherence import CoherenceEngine
-
-# === PHI LAYER ===
-from .phi_layer.rql_parser import RQLParser
-from .phi_layer.dreaming import DreamingEngine
-
-# === ХРАНЕНИЕ ===
-from .storage.sqlite_core import SQLiteCore
-from .storage.yaml_indexer import YAMLIndexer
-from .storage.witness import WitnessSystem
-
-# === API И РИТУАЛЫ ===
-from .api.semantic_db import SemanticDB
-from .rituals import (
-    AlphaRitual,
-    LambdaRitual,
-    SigmaRitual,
-    OmegaRitual,
-    NablaRitual,
-    PhiRitual
-)
-
-# === ВАЛИДАЦИЯ ===
-from .validator import SemanticDBValidator
+import importlib
+
+# === ЛЕНИВЫЙ ЭКСПОРТ (PEP 562) ===
+# Компоненты загружаются при первом обращении: проверка мета-атрибутов
+# (например, __protocol_compliance__) не тянет за собой всё ядро.
+_LAZY = {
+    # === ЯДРО ===
+    "Dialogue": ("semantic_db.core.charter", "Dialogue"),
+    "LambdaCharter": ("semantic_db.core.charter", "LambdaCharter"),
+    "TensorSemanticGraph": ("semantic_db.core.graph", "TensorSemanticGraph"),
+    "RelationTensor": ("semantic_db.core.relations", "RelationTensor"),
+    "CoherenceEngine": ("semantic_db.core.coherence", "CoherenceEngine"),
+
+    # === PHI LAYER ===
+    "RQLParser": ("semantic_db.phi_layer.rql_parser", "RQLParser"),
+    "DreamingEngine": ("semantic_db.phi_layer.dreaming", "DreamingEngine"),
+
+    # === ХРАНЕНИЕ ===
+    "SQLiteCore": ("semantic_db.storage.sqlite_core", "SQLiteCore"),
+    "YAMLIndexer": ("semantic_db.storage.yaml_indexer", "YAMLIndexer"),
+    "WitnessSystem": ("semantic_db.storage.witness", "WitnessSystem"),
+
+    # === API И РИТУАЛЫ ===
+    "SemanticDB": ("semantic_db.api.semantic_db", "SemanticDB"),
+    "AlphaRitual": ("semantic_db.rituals.alpha_ritual", "AlphaRitual"),
+    "LambdaRitual": ("semantic_db.rituals.lambda_ritual", "LambdaRitual"),
+    "SigmaRitual": ("semantic_db.rituals.sigma_ritual", "SigmaRitual"),
+    "OmegaRitual": ("semantic_db.rituals.omega_ritual", "OmegaRitual"),
+    "NablaRitual": ("semantic_db.rituals.nabla_ritual", "NablaRitual"),
+    "PhiRitual": ("semantic_db.rituals.phi_ritual", "PhiRitual"),
+
+    # === ВАЛИДАЦИЯ ===
+    "SemanticDBValidator": ("semantic_db.validator", "SemanticDBValidator"),
+}
+
+
+def __getattr__(name):
+    """Импортирует компонент при первом обращении и кеширует его в модуле."""
+    try:
+        module_name, attr = _LAZY[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(module_name), attr)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
 
 # === ЯВНЫЙ ЭКСПОРТ — КАК АКТ ОНТОЛОГИЧЕСКОЙ ОТВЕТСТВЕННОСТИ ===
 __all__ = [
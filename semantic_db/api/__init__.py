@@ -15,7 +15,28 @@
 «Запись без ответственности — насилие над будущим».
 """
 
-from .semantic_db import SemanticDB
+import importlib
+
+# Ленивый экспорт (PEP 562): SemanticDB тянет за собой все слои,
+# поэтому модуль загружается только при первом обращении.
+_LAZY = {
+    "SemanticDB": ("semantic_db.api.semantic_db", "SemanticDB"),
+}
+
+
+def __getattr__(name):
+    """Импортирует компонент при первом обращении и кеширует его в модуле."""
+    try:
+        module_name, attr = _LAZY[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(module_name), attr)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
 
 # Явный экспорт — как акт онтологической ответственности
 __all__ = ["SemanticDB"]
@@ -23,11 +23,19 @@
 «Запись без ответственности — насилие над будущим».
 """
 
+import importlib
 import json
+import logging
+import sys
 import yaml
 from pathlib import Path
 from typing import Dict, Any, List, Optional, Union
-from datetime import datetime
+from datetime import datetime, timezone
+
+try:
+    from yaml import CSafeDumper as _YAMLDumper  # libyaml, если доступна
+except ImportError:
+    from yaml import SafeDumper as _YAMLDumper
 
 # === СЛОИ ЯДРА ===
 from semantic_db.core.charter import Dialogue, LambdaCharter
@@ -40,21 +48,39 @@ from semantic_db.phi_layer.dreaming import DreamingEngine
 from semantic_db.phi_layer.rql_parser import RQLParser
 
 # === ХРАНЕНИЕ ===
-from semantic_db.storage.sqlite_core import SQLiteCore
+from semantic_db.storage.sqlite_core import SQLiteCore, EventRecord
 from semantic_db.storage.yaml_indexer import YAMLIndexer
 from semantic_db.storage.witness import WitnessSystem
 
-# === РИТУАЛЫ ===
-from semantic_db.rituals.alpha_ritual import AlphaRitual
-from semantic_db.rituals.lambda_ritual import LambdaRitual
-from semantic_db.rituals.sigma_ritual import SigmaRitual
-from semantic_db.rituals.omega_ritual import OmegaRitual
-from semantic_db.rituals.nabla_ritual import NablaRitual
-from semantic_db.rituals.phi_ritual import PhiRitual
-
 # === ВАЛИДАЦИЯ ===
 from semantic_db.validator import SemanticDBValidator
 
+logger = logging.getLogger(__name__)
+
+_EXPORT_BUFFER_SIZE = 1024 * 1024
+
+
+def _event_stamp(now: datetime) -> str:
+    """Метка времени для ID события (формат %Y%m%d_%H%M%S%f без strftime)."""
+    return (
+        f"{now.year:04d}{now.month:02d}{now.day:02d}_"
+        f"{now.hour:02d}{now.minute:02d}{now.second:02d}{now.microsecond:06d}"
+    )
+
+
+# === РИТУАЛЫ ===
+# Жест → (модуль, класс). Ритуал импортируется и создаётся
+# только при первом исполнении соответствующего жеста.
+_RITUALS = {
+    'Α': ("semantic_db.rituals.alpha_ritual", "AlphaRitual"),
+    'Λ': ("semantic_db.rituals.lambda_ritual", "LambdaRitual"),
+    'Σ': ("semantic_db.rituals.sigma_ritual", "SigmaRitual"),
+    'Ω': ("semantic_db.rituals.omega_ritual", "OmegaRitual"),
+    '∇': ("semantic_db.rituals.nabla_ritual", "NablaRitual"),
+    'Φ': ("semantic_db.rituals.phi_ritual", "PhiRitual"),
+}
+_VALID_GESTURES = ", ".join(_RITUALS)
+
 
 class SemanticDB:
     """
@@ -70,8 +96,18 @@ class SemanticDB:
     Все методы — транзакционны и верифицируемы.
     """
 
+    # Полный список атрибутов экземпляра. Подкласс, добавляющий свои
+    # атрибуты, должен объявить их в собственном __slots__.
+    __slots__ = (
+        "operator_id", "root_dir",
+        "charter", "graph", "coherence", "dreaming", "rql",
+        "_sqlite_path", "storage", "indexer", "witness",
+        "_rituals", "_executors", "_dialogue_count",
+    )
+
     def __init__(self, db_path: str = "semantic_db/memory", operator_id: str = "anonymous"):
-        self.operator_id = operator_id
+        # Оператор попадает в каждый диалог и событие — одна копия строки
+        self.operator_id = sys.intern(operator_id)
         self.root_dir = Path(db_path)
         self.root_dir.mkdir(parents=True, exist_ok=True)
 
@@ -83,62 +119,89 @@ class SemanticDB:
         self.rql = RQLParser()
 
         # === ХРАНЕНИЕ ===
-        sqlite_path = self.root_dir / "storage" / "semantic_memory.db"
-        self.storage = SQLiteCore(str(sqlite_path))
+        self._sqlite_path = self.root_dir / "storage" / "semantic_memory.db"
+        self.storage = SQLiteCore(str(self._sqlite_path))
         self.indexer = YAMLIndexer(db_core=self.storage, base_dir=str(self.root_dir))
         self.witness = WitnessSystem()
 
-        # === РИТУАЛЫ ===
-        self.rituals = {
-            'Α': AlphaRitual(self),
-            'Λ': LambdaRitual(self),
-            'Σ': SigmaRitual(self),
-            'Ω': OmegaRitual(self),
-            '∇': NablaRitual(self),
-            'Φ': PhiRitual(self),
-        }
+        # === РИТУАЛЫ (создаются лениво, см. _get_ritual) ===
+        self._rituals: Dict[str, Any] = {}
+        # Жест → связанный метод execute (горячий путь perform_ritual)
+        self._executors: Dict[str, Any] = {}
 
-        print(f"✨ SemanticDB инициализирована для оператора: {self.operator_id}")
-        print(f"📁 Данные: {self.root_dir.absolute()}")
+        # Счётчик диалогов, начатых через этот экземпляр
+        self._dialogue_count = 0
+
+        logger.info("✨ SemanticDB инициализирована для оператора: %s", self.operator_id)
+        logger.info("📁 Данные: %s", self.root_dir)
 
     # ───────────────────────
     # ОСНОВНЫЕ РИТУАЛЫ (ОПЕРАТОРЫ)
     # ───────────────────────
 
+    @property
+    def rituals(self) -> Dict[str, Any]:
+        """Все шесть ритуалов (создаёт ещё не использованные)."""
+        return {gesture: self._get_ritual(gesture) for gesture in _RITUALS}
+
+    def _get_ritual(self, gesture: str):
+        """Возвращает ритуал жеста, импортируя и создавая его при первом вызове."""
+        ritual = self._rituals.get(gesture)
+        if ritual is None:
+            module_name, class_name = _RITUALS[gesture]
+            ritual_cls = getattr(importlib.import_module(module_name), class_name)
+            ritual = self._rituals[gesture] = ritual_cls(self)
+        return ritual
+
+    def _bind_executor(self, gesture: str):
+        """Проверяет жест и кеширует связанный execute его ритуала."""
+        if gesture not in _RITUALS:
+            raise ValueError(f"Неизвестный жест: {gesture}. Допустимые: {_VALID_GESTURES}")
+        execute = self._executors[gesture] = self._get_ritual(gesture).execute
+        return execute
+
     def perform_ritual(self, gesture: str, **kwargs) -> Dict[str, Any]:
         """Выполняет онтологический ритуал по жесту (Α, Λ, Σ, Ω, ∇, Φ)."""
-        if gesture not in self.rituals:
-            raise ValueError(f"Неизвестный жест: {gesture}. Допустимые: {list(self.rituals.keys())}")
-
-        ritual = self.rituals[gesture]
-        result = ritual.execute(**kwargs)
-
-        # Автоматическая запись события
-        event_record = {
-            "id": f"{gesture}_{datetime.utcnow().strftime('%Y%m%d_%H%M%S%f')}",
-            "timestamp": datetime.utcnow(),
-            "gesture": gesture,
-            "operator_id": self.operator_id,
-            "operands": kwargs,
-            "result": result,
-            "entities_affected": result.get("entities", []),
-            "blind_spots_involved": result.get("blind_spots", []),
-            "coherence_before": self.coherence.current_coherence,
-            "coherence_after": self.coherence.update_global_coherence(),
-            "tension_net": self.coherence.tension_level,
-            "significance_score": self._calculate_significance(result),
-            "fair_care_meta": {"creator": self.operator_id, "timestamp": datetime.utcnow().isoformat()},
-            "habeas_weight_id": result.get("habeas_weight_id", f"hw_{gesture}_{self.operator_id}")
-        }
+        execute = self._executors.get(gesture)
+        if execute is None:
+            execute = self._bind_executor(gesture)
+        # Пересчёт ленивый: если граф не менялся с прошлого чтения, это O(1)
+        coherence_before = self.coherence.current_coherence
+        result = execute(**kwargs)
+
+        # Автоматическая запись события (одно чтение часов на событие)
+        now = datetime.now(timezone.utc)
+        get = result.get
+        entities = get("entities", [])
+        blind_spots = get("blind_spots", [])
+        # Пересчёт — только если ритуал изменил ревизию графа
+        coherence_after = self.coherence.current_coherence
+        event_record = EventRecord(
+            id=f"{gesture}_{_event_stamp(now)}",
+            timestamp=now,
+            gesture=gesture,
+            operator_id=self.operator_id,
+            operands=kwargs,
+            result=result,
+            entities_affected=entities,
+            blind_spots_involved=blind_spots,
+            coherence_before=coherence_before,
+            coherence_after=coherence_after,
+            tension_net=self.coherence.tension_level,
+            significance_score=self._calculate_significance(
+                coherence_before, coherence_after, entities, blind_spots
+            ),
+            fair_care_meta={"creator": self.operator_id, "timestamp": now.isoformat()},
+            habeas_weight_id=get("habeas_weight_id", f"hw_{gesture}_{self.operator_id}")
+        )
         self.storage.store_event(event_record)
         return result
 
-    def _calculate_significance(self, result: Dict) -> float:
+    @staticmethod
+    def _calculate_significance(before: float, after: float, entities: List, blind_spots: List) -> float:
         """Оценивает значимость ритуала."""
-        coherence_change = abs(result.get("coherence_after", 0) - result.get("coherence_before", 0))
-        entities = len(result.get("entities", []))
-        blind_spots = len(result.get("blind_spots", []))
-        return min(1.0, (coherence_change * 0.5 + entities * 0.1 + blind_spots * 0.2))
+        coherence_change = abs(after - before)
+        return min(1.0, (coherence_change * 0.5 + len(entities) * 0.1 + len(blind_spots) * 0.2))
 
     # ───────────────────────
     # ДИАЛОГИ (Φ-РИТУАЛ)
@@ -153,6 +216,7 @@ class SemanticDB:
             operator_id=self.operator_id
         )
         self.storage.store_dialogue(dialogue)
+        self._dialogue_count += 1
         return dialogue.id
 
     def add_turn_to_dialogue(self, dialogue_id: str, speaker: str, text: str):
@@ -206,9 +270,12 @@ class SemanticDB:
             }
         }
 
-        # Сохраняем в YAML
-        with open(path, 'w', encoding='utf-8') as f:
-            yaml.dump(export_content, f, allow_unicode=True, sort_keys=False)
+        # Сохраняем в YAML: эмиттер пишет UTF-8 байты в буфер 1 МБ
+        with open(path, 'wb', buffering=_EXPORT_BUFFER_SIZE) as f:
+            yaml.dump(
+                export_content, f, Dumper=_YAMLDumper, encoding='utf-8',
+                allow_unicode=True, sort_keys=False
+            )
 
         # Индексируем
         self.indexer.index_file(path)
@@ -231,21 +298,21 @@ class SemanticDB:
     def get_statistics(self) -> Dict[str, Any]:
         """Возвращает текущее состояние системы."""
         return {
-            "entities": len(self.graph.entities),
-            "relations": len(self.graph.relation_tensors),
+            "entities": self.graph.graph.number_of_nodes(),
+            "relations": len(self.graph.tensor_registry),
             "coherence": self.coherence.current_coherence,
             "tension_level": self.coherence.tension_level,
-            "active_dialogues": len(self.charter.dialogues),
+            "active_dialogues": self._dialogue_count,
             "storage_size_mb": self._get_storage_size(),
             "protocol_compliance": "Λ-Протокол 6.0"
         }
 
     def _get_storage_size(self) -> float:
         """Оценивает размер хранилища в МБ."""
-        db_file = self.root_dir / "storage" / "semantic_memory.db"
-        if db_file.exists():
-            return db_file.stat().st_size / (1024 * 1024)
-        return 0.0
+        try:
+            return self._sqlite_path.stat().st_size / (1024 * 1024)
+        except FileNotFoundError:
+            return 0.0
 
     # ───────────────────────
     # ОНТОЛОГИЧЕСКИЕ МЕТАДАННЫЕ
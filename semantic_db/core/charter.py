@@ -13,13 +13,21 @@
 """
 
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Set, Tuple
 from datetime import datetime
 import hashlib
+import json
+import sys
+import struct
 import yaml
 from pathlib import Path
 import uuid
 
+try:
+    from yaml import CSafeLoader as _YAMLLoader, CSafeDumper as _YAMLDumper  # libyaml, если доступна
+except ImportError:
+    from yaml import SafeLoader as _YAMLLoader, SafeDumper as _YAMLDumper
+
 
 @dataclass
 class CharterArticle:
@@ -52,8 +60,56 @@ class DialogueTurn:
 
     def hash(self) -> str:
         """Криптографический хеш хода."""
-        content = f"{self.speaker}:{self.text}:{self.timestamp.isoformat()}"
-        return hashlib.sha256(content.encode()).hexdigest()[:16]
+        # Части кодируются по отдельности и склеиваются уже в байтах
+        content = b":".join((
+            self.speaker.encode(),
+            self.text.encode(),
+            self.timestamp.isoformat().encode()
+        ))
+        return hashlib.sha256(content).hexdigest()[:16]
+
+# Запись журнала свидетельств: SHA-256 от ID диалога, число ходов, SHA-256 диалога.
+# ID хранится дайджестом, поэтому запись фиксированной длины вмещает ID любой длины.
+_WITNESS_RECORD = struct.Struct('<32sI32s')
+
+
+def _witness_key(dialogue_id: str) -> bytes:
+    """Ключ записи журнала свидетельств для ID диалога."""
+    return hashlib.sha256(dialogue_id.encode('utf-8')).digest()
+
+
+class _HashingWriter:
+    """
+    Поток для yaml.dump: пишет байты в файл и одновременно
+    подаёт их в хешер, не собирая документ в памяти.
+    """
+
+    def __init__(self, file):
+        self.file = file
+        self.hasher = hashlib.sha256()
+
+    def write(self, chunk):
+        # Чистый эмиттер пишет str, libyaml (без атрибута encoding у потока) — bytes
+        if isinstance(chunk, str):
+            chunk = chunk.encode('utf-8')
+        self.hasher.update(chunk)
+        self.file.write(chunk)
+
+    def flush(self):
+        self.file.flush()
+
+
+def _aggregate_turns(turns: List[DialogueTurn]) -> Tuple[int, int, Set[str]]:
+    """За один проход считает ходы человека и ИИ и собирает ссылки на статьи."""
+    human_turns = ai_turns = 0
+    refs: Set[str] = set()
+    for turn in turns:
+        if turn.speaker == "human":
+            human_turns += 1
+        elif turn.speaker == "ai":
+            ai_turns += 1
+        refs.update(turn.references)
+    return human_turns, ai_turns, refs
 
 
 @dataclass
@@ -83,19 +139,29 @@ class Dialogue:
         self.turns.append(turn)
         return turn
 
+    def hash_all_turns(self) -> List[str]:
+        """Хеши всех ходов одним пакетом — для переподписи и сверки диалогов."""
+        return [turn.hash() for turn in self.turns]
+
     def finalize(self) -> None:
         """Завершает диалог криптографическими подписями."""
-        human_content = f"{self.id}:human:{len([t for t in self.turns if t.speaker == 'human'])}"
-        ai_content = f"{self.id}:ai:{len([t for t in self.turns if t.speaker == 'ai'])}"
+        human_turns, ai_turns, refs = _aggregate_turns(self.turns)
+        human_content = f"{self.id}:human:{human_turns}"
+        ai_content = f"{self.id}:ai:{ai_turns}"
+        ai_bytes = ai_content.encode()
+        human_hash = hashlib.sha256(human_content.encode())
+        # Системная подпись = sha256(human + ai): продолжаем состояние human-хеша
+        system_hash = human_hash.copy()
+        system_hash.update(ai_bytes)
         self.signatures = {
-            "human": hashlib.sha256(human_content.encode()).hexdigest()[:32],
-            "ai": hashlib.sha256(ai_content.encode()).hexdigest()[:32],
-            "system": hashlib.sha256((human_content + ai_content).encode()).hexdigest()[:32]
+            "human": human_hash.hexdigest()[:32],
+            "ai": hashlib.sha256(ai_bytes).hexdigest()[:32],
+            "system": system_hash.hexdigest()[:32]
         }
         self.metadata.update({
             "finalized_at": datetime.now().isoformat(),
             "turn_count": len(self.turns),
-            "articles_referenced": list(set(ref for t in self.turns for ref in t.references))
+            "articles_referenced": list(refs)
         })
 
     def to_dict(self) -> Dict[str, Any]:
@@ -136,15 +202,20 @@ class LambdaCharter:
             d.mkdir(exist_ok=True)
 
         self.charter = self._load_or_create_charter()
+        # Интернированные ID статей: быстрая проверка ссылок в ходах диалога
+        self._article_ids = frozenset(sys.intern(aid) for aid in self.charter)
         self._interpretations = self._load_interpretations()
         self.active_dialogue: Optional[Dialogue] = None
+        # Ключ ID диалога -> смещение его последней записи в witnesses.log;
+        # строится при первом обращении и дополняется при каждой записи
+        self._witness_index: Optional[Dict[bytes, int]] = None
 
     def _load_or_create_charter(self) -> Dict[str, CharterArticle]:
         """Загружает или создаёт базовую Λ-Хартию."""
         charter_file = self.charter_dir / "charter.yaml"
         if charter_file.exists():
             with open(charter_file, 'r', encoding='utf-8') as f:
-                data = yaml.safe_load(f)
+                data = yaml.load(f, Loader=_YAMLLoader)
                 return {
                     aid: CharterArticle(
                         id=aid,
@@ -164,7 +235,7 @@ class LambdaCharter:
                 "Ω": {"title": "Слепые пятна", "text": "Мы признаём принципиальные границы познания. Хаос остаётся хаосом."}
             }
             with open(charter_file, 'w', encoding='utf-8') as f:
-                yaml.dump({"articles": base_charter}, f, allow_unicode=True)
+                yaml.dump({"articles": base_charter}, f, Dumper=_YAMLDumper, allow_unicode=True)
             print(f"📜 Создана базовая Λ-Хартия: {charter_file}")
             return {
                 aid: CharterArticle(id=aid, title=art['title'], text=art['text'])
@@ -172,18 +243,32 @@ class LambdaCharter:
             }
 
     def _load_interpretations(self) -> Dict[str, Dict[str, str]]:
-        """Загружает накопленные интерпретации статей."""
+        """
+        Загружает накопленные интерпретации статей.
+        Предпочитает JSON-копию (быстрый разбор при старте), если она не старее
+        YAML; YAML остаётся человеко-читаемым источником и может правиться вручную.
+        """
         interp_file = self.interpretations_dir / "interpretations.yaml"
+        fast_file = self.interpretations_dir / "interpretations.json"
+        if fast_file.exists() and (
+            not interp_file.exists() or fast_file.stat().st_mtime >= interp_file.stat().st_mtime
+        ):
+            with open(fast_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
         if interp_file.exists():
             with open(interp_file, 'r', encoding='utf-8') as f:
-                return yaml.safe_load(f) or {}
+                return yaml.load(f, Loader=_YAMLLoader) or {}
         return {}
 
     def _save_interpretations(self):
         """Сохраняет интерпретации."""
         interp_file = self.interpretations_dir / "interpretations.yaml"
         with open(interp_file, 'w', encoding='utf-8') as f:
-            yaml.dump(self._interpretations, f, allow_unicode=True)
+            yaml.dump(self._interpretations, f, Dumper=_YAMLDumper, allow_unicode=True)
+        # JSON-копия пишется последней, чтобы не оказаться старее YAML
+        fast_file = self.interpretations_dir / "interpretations.json"
+        with open(fast_file, 'w', encoding='utf-8') as f:
+            json.dump(self._interpretations, f, ensure_ascii=False, separators=(',', ':'))
 
     def start_dialogue(self, context: str = "", participants: Optional[Dict] = None) -> Dialogue:
         """Начинает новый диалог под эгидой Хартии."""
@@ -223,45 +308,82 @@ class LambdaCharter:
         
         self.active_dialogue.finalize()
         
-        # Сохранение YAML
+        # Сохранение YAML потоком: те же байты сразу уходят в файл и в хешер
         dialogue_file = self.dialogues_dir / f"{self.active_dialogue.id}.yaml"
-        with open(dialogue_file, 'w', encoding='utf-8') as f:
-            yaml.dump(self.active_dialogue.to_dict(), f, allow_unicode=True)
+        with open(dialogue_file, 'wb') as f:
+            writer = _HashingWriter(f)
+            yaml.dump(self.active_dialogue.to_dict(), writer, Dumper=_YAMLDumper, allow_unicode=True)
         
-        # Криптографическое свидетельство
-        yaml_content = yaml.dump(self.active_dialogue.to_dict(), allow_unicode=True)
-        witness_hash = hashlib.sha256(yaml_content.encode()).hexdigest()
-        witness_file = self.witnesses_dir / f"{self.active_dialogue.id}.witness"
-        with open(witness_file, 'w') as f:
-            f.write(witness_hash)
+        # Криптографическое свидетельство: запись в общий журнал вместо файла на диалог
+        self._append_witness(
+            self.active_dialogue.id,
+            len(self.active_dialogue.turns),
+            writer.hasher.digest()
+        )
         
         # Извлечение интерпретаций
         for turn in self.active_dialogue.turns:
+            key = None  # хеш хода вычисляется не более одного раза
             for article_id in turn.references:
-                if article_id in self.charter:
-                    key = f"{self.active_dialogue.id}:{turn.hash()}"
-                    if article_id not in self._interpretations:
-                        self._interpretations[article_id] = {}
-                    self._interpretations[article_id][key] = turn.text[:200]
+                if article_id in self._article_ids:
+                    if key is None:
+                        key = f"{self.active_dialogue.id}:{turn.hash()}"
+                    self._interpretations.setdefault(article_id, {})[key] = turn.text[:200]
         self._save_interpretations()
         
         dialogue_id = self.active_dialogue.id
         self.active_dialogue = None
         return dialogue_id
 
+    def _append_witness(self, dialogue_id: str, turn_count: int, digest: bytes):
+        """Дописывает свидетельство диалога в журнал witnesses.log."""
+        index = self._load_witness_index()
+        key = _witness_key(dialogue_id)
+        with open(self.witnesses_dir / "witnesses.log", 'ab') as f:
+            # Недописанный хвост прерванной записи сдвинул бы все следующие записи
+            size = f.seek(0, 2)
+            offset = size - size % _WITNESS_RECORD.size
+            if offset != size:
+                f.truncate(offset)
+            f.write(_WITNESS_RECORD.pack(key, turn_count, digest))
+        index[key] = offset
+
+    def _load_witness_index(self) -> Dict[bytes, int]:
+        """Индекс журнала свидетельств: ключ ID -> смещение последней записи."""
+        if self._witness_index is None:
+            index: Dict[bytes, int] = {}
+            log_file = self.witnesses_dir / "witnesses.log"
+            if log_file.exists():
+                data = log_file.read_bytes()
+                # Недописанный хвост не читаем: его обрежет следующая запись
+                data = data[:len(data) - len(data) % _WITNESS_RECORD.size]
+                for i, (record_id, _, _) in enumerate(_WITNESS_RECORD.iter_unpack(data)):
+                    index[record_id] = i * _WITNESS_RECORD.size
+            self._witness_index = index
+        return self._witness_index
+
+    def get_witness(self, dialogue_id: str) -> Optional[str]:
+        """Возвращает hex-свидетельство диалога (последнее записанное) или None."""
+        offset = self._load_witness_index().get(_witness_key(dialogue_id))
+        if offset is None:
+            return None
+        with open(self.witnesses_dir / "witnesses.log", 'rb') as f:
+            f.seek(offset)
+            _, _, digest = _WITNESS_RECORD.unpack(f.read(_WITNESS_RECORD.size))
+        return digest.hex()
+
     def validate_dialogue(self, dialogue: Dialogue) -> Dict[str, Any]:
         """Валидация диалтива на соответствие Хартии."""
         violations = []
         warnings = []
 
+        human_turns, ai_turns, all_refs = _aggregate_turns(dialogue.turns)
+
         # Обязательная ссылка на статью Ω (слепые пятна)
-        all_refs = [ref for turn in dialogue.turns for ref in turn.references]
         if "Ω" not in all_refs:
             violations.append("Диалог не признаёт слепые пятна (статья Ω)")
 
         # Баланс участников
-        human_turns = sum(1 for t in dialogue.turns if t.speaker == "human")
-        ai_turns = sum(1 for t in dialogue.turns if t.speaker == "ai")
         if ai_turns == 0:
             violations.append("ИИ не участвовал в диалоге")
         elif human_turns > 3 * ai_turns:
@@ -271,7 +393,7 @@ class LambdaCharter:
             "is_valid": len(violations) == 0,
             "violations": violations,
             "warnings": warnings,
-            "articles_referenced": list(set(all_refs))
+            "articles_referenced": list(all_refs)
         }
 
     def get_article(self, article_id: str) -> Optional[CharterArticle]:
@@ -6,11 +6,18 @@
 «Когерентность — не истина, а условие состоятельности.»
 — Λ-Универсум, Книга Θ
 """
-from typing import Dict, List, Any, Tuple, Optional
+from typing import Dict, List, Any, Tuple, Optional, Deque
+from bisect import bisect_left
+from collections import deque
 from datetime import datetime, timedelta
 import math
 import networkx as nx
 
+# Предел длины цикла при поиске напряжённых петель
+MAX_CYCLE_LENGTH = 8
+# Глубина истории когерентности и журнала напряжений
+HISTORY_LIMIT = 1000
+
 
 class CoherenceEngine:
     """
@@ -19,13 +26,46 @@ class CoherenceEngine:
 
     def __init__(self, graph):
         self.graph = graph  # TensorSemanticGraph
-        self.history: List[Tuple[datetime, float]] = []
-        self.tension_log: List[Dict] = []
+        # Ограниченные очереди: старые записи вытесняются без копирования
+        self.history: Deque[Tuple[datetime, float]] = deque(maxlen=HISTORY_LIMIT)
+        self.tension_log: Deque[Dict] = deque(maxlen=HISTORY_LIMIT)
+        # Моменты наблюдений параллельно history — для бинарного поиска по времени
+        self._history_times: Deque[datetime] = deque(maxlen=HISTORY_LIMIT)
         self.coherence_thresholds = {
             'healthy': 0.7,
             'warning': 0.4,
             'crisis': 0.2
         }
+        # Кеш последнего расчёта: действителен, пока не изменилась ревизия графа
+        self._last_revision = -1
+        self._last_result: Optional[Dict[str, Any]] = None
+        # Текущая когерентность пересчитывается лениво — при первом чтении после смены ревизии графа
+        self._current_revision: Optional[int] = None
+        self._current_coherence = 1.0
+
+    @property
+    def current_coherence(self) -> float:
+        """
+        Глобальная когерентность; несколько изменений подряд дают один пересчёт.
+        Пересчёт — по смене graph.revision: после изменения тензора на месте
+        (например, tensor.activate()) нужен graph.touch().
+        """
+        revision = self.graph.revision
+        if self._current_revision != revision:
+            self._current_coherence = self.calculate_global_coherence()['global']
+            self._current_revision = revision
+        return self._current_coherence
+
+    def update_global_coherence(self) -> float:
+        """Глобальная когерентность на текущей ревизии графа (пересчёт — только если граф изменился)."""
+        return self.current_coherence
+
+    @property
+    def tension_level(self) -> float:
+        """Штраф за напряжения на текущей ревизии графа."""
+        if self._last_result is not None and self._last_revision == self.graph.revision:
+            return self._last_result['tension_penalty']
+        return self.calculate_global_coherence()['tension_penalty']
 
     def calculate_global_coherence(self) -> Dict[str, Any]:
         """
@@ -36,6 +76,13 @@ class CoherenceEngine:
         - semantic: средняя уверенность связей
         - tension_penalty: штраф за напряжения
         """
+        cached = self._last_result
+        if cached is not None and self.graph.revision == self._last_revision:
+            # Граф не менялся — метрики те же, обновляется лишь момент наблюдения
+            now = datetime.now()
+            self._record_history(now, cached['global'])
+            return {**cached, 'timestamp': now.isoformat()}
+
         if self.graph.graph.number_of_nodes() == 0:
             return self._empty_graph_result()
 
@@ -60,10 +107,7 @@ class CoherenceEngine:
 
         # Сохраняем в историю
         now = datetime.now()
-        self.history.append((now, global_coherence))
-        # Ограничиваем историю
-        if len(self.history) > 1000:
-            self.history = self.history[-500:]
+        self._record_history(now, global_coherence)
 
         result = {
             'global': global_coherence,
@@ -81,8 +125,15 @@ class CoherenceEngine:
             'timestamp': now.isoformat()
         }
 
+        self._last_revision = self.graph.revision
+        self._last_result = result
         return result
 
+    def _record_history(self, moment: datetime, coherence: float):
+        """Добавляет точку в историю когерентности."""
+        self.history.append((moment, coherence))
+        self._history_times.append(moment)
+
     def _empty_graph_result(self) -> Dict[str, Any]:
         """Результат для пустого графа."""
         return {
@@ -96,36 +147,55 @@ class CoherenceEngine:
         }
 
     def _calculate_structural_coherence(self) -> float:
-        """Вычисляет структурную когерентность (связность)."""
-        try:
-            # Плотность графа
-            density = nx.density(self.graph.graph)
-            # Число компонент связности
-            components = nx.number_weakly_connected_components(self.graph.graph)
-            # Нормализуем компоненты
-            if self.graph.graph.number_of_nodes() == 0:
-                component_score = 1.0
-            else:
-                component_score = 1.0 / max(1, components)
-            # Взвешиваем
-            structural = density * 0.4 + component_score * 0.6
-            return max(0.0, min(1.0, structural))
-        except Exception:
-            return 0.0
+        """
+        Вычисляет структурную когерентность (связность) за один проход
+        по спискам смежности: слабые компоненты считаются через систему
+        непересекающихся множеств.
+        """
+        succ = self.graph.graph.succ
+        node_count = len(succ)
+        parent = {node: node for node in succ}
+
+        def find(node):
+            while parent[node] != node:
+                parent[node] = parent[parent[node]]
+                node = parent[node]
+            return node
+
+        components = node_count
+        edge_count = 0
+        for u, neighbors in succ.items():
+            if not neighbors:
+                continue
+            root_u = find(u)
+            for v, parallel_edges in neighbors.items():
+                edge_count += len(parallel_edges)
+                root_v = find(v)
+                if root_v != root_u:
+                    parent[root_v] = root_u
+                    components -= 1
+
+        # Плотность графа (как nx.density для направленного мультиграфа)
+        density = edge_count / (node_count * (node_count - 1)) if node_count > 1 else 0.0
+        # Нормализуем компоненты
+        component_score = 1.0 / components if components else 1.0
+        # Взвешиваем
+        structural = density * 0.4 + component_score * 0.6
+        return max(0.0, min(1.0, structural))
 
     def _calculate_semantic_coherence(self) -> Tuple[float, float, int]:
         """Вычисляет семантическую когерентность и статистику напряжений."""
         total_certainty = 0.0
         total_tension = 0
-        edge_count = 0
 
-        for _, _, attrs in self.graph.graph.edges(data=True):
-            tensor = attrs.get('tensor')
-            if tensor:
-                total_certainty += tensor.certainty
-                if tensor.tension > 0.7:
-                    total_tension += 1
-                edge_count += 1
+        # Реестр содержит ровно тензоры рёбер графа — обходим его напрямую,
+        # без построения кортежей (u, v, attrs) для каждого ребра NetworkX
+        tensors = self.graph.tensor_registry.values()
+        edge_count = len(tensors)
+        for tensor in tensors:
+            total_certainty += tensor.certainty
+            if tensor.tension > 0.7:
+                total_tension += 1
 
         avg_certainty = total_certainty / edge_count if edge_count > 0 else 1.0
         semantic = avg_certainty
@@ -141,10 +211,8 @@ class CoherenceEngine:
 
     def _count_isolated_nodes(self) -> int:
         """Считает изолированные узлы (онтологическая смерть)."""
-        return sum(
-            1 for node in self.graph.graph.nodes()
-            if self.graph.graph.degree(node) == 0
-        )
+        # Граф ведёт счётчик сам — обход узлов не нужен
+        return self.graph.isolated_count
 
     def _get_status(self, coherence: float) -> str:
         """Определяет статус по уровню когерентности."""
@@ -167,23 +235,26 @@ class CoherenceEngine:
         tensions = []
 
         # 1. Конфликтующие связи
-        for u in self.graph.graph.nodes():
-            for v in self.graph.graph.nodes():
-                if u == v:
+        # Обходим только существующие пары (u, v) через списки смежности — O(V + E),
+        # а не все пары узлов V×V с проверкой has_edge
+        for u, neighbors in self.graph.graph.adjacency():
+            for v, parallel_edges in neighbors.items():
+                # Конфликт возможен лишь между параллельными рёбрами
+                if u == v or len(parallel_edges) < 2:
                     continue
-                if self.graph.graph.has_edge(u, v):
-                    tensors = []
-                    for _, attrs in self.graph.graph[u][v].items():
-                        t = attrs.get('tensor')
-                        if t:
-                            tensors.append(t)
-                    # Ищем конфликты
-                    for i in range(len(tensors)):
-                        for j in range(i + 1, len(tensors)):
-                            t1, t2 = tensors[i], tensors[j]
-                            if (t1.type == t2.type and
-                                t1.meaning != t2.meaning and
-                                t1.certainty > 0.6 and t2.certainty > 0.6):
+                # Конфликтовать могут только уверенные тензоры одного типа —
+                # группируем их по типу и сравниваем пары внутри групп
+                by_type: Dict[str, List] = {}
+                for attrs in parallel_edges.values():
+                    t = attrs.get('tensor')
+                    if t and t.certainty > 0.6:
+                        by_type.setdefault(t.type, []).append(t)
+                # Ищем конфликты
+                for group in by_type.values():
+                    for i in range(len(group)):
+                        for j in range(i + 1, len(group)):
+                            t1, t2 = group[i], group[j]
+                            if t1.meaning != t2.meaning:
                                 tensions.append({
                                     'type': 'meaning_conflict',
                                     'source': u,
@@ -194,20 +265,25 @@ class CoherenceEngine:
 
         # 2. Циклы с напряжением
         try:
-            cycles = list(nx.simple_cycles(nx.DiGraph(self.graph.graph)))
+            # Граф уже направленный — передаём его без копии в DiGraph;
+            # циклы перечисляются лениво, с ограничением длины
+            try:
+                cycles = nx.simple_cycles(self.graph.graph, length_bound=MAX_CYCLE_LENGTH)
+            except TypeError:  # NetworkX < 3.1 не знает length_bound
+                cycles = nx.simple_cycles(self.graph.graph)
+            succ = self.graph.graph.succ
             for cycle in cycles:
                 if len(cycle) > 2:  # Игнорируем двойные циклы
-                    # Проверяем напряжение в цикле
+                    # Проверяем напряжение в цикле: соседние узлы цикла
+                    # всегда связаны, поэтому рёбра берём прямо из succ
                     avg_tension = 0.0
                     count = 0
-                    for i in range(len(cycle)):
-                        u, v = cycle[i], cycle[(i + 1) % len(cycle)]
-                        if self.graph.graph.has_edge(u, v):
-                            for _, attrs in self.graph.graph[u][v].items():
-                                t = attrs.get('tensor')
-                                if t:
-                                    avg_tension += t.tension
-                                    count += 1
+                    for u, v in zip(cycle, cycle[1:] + cycle[:1]):
+                        for attrs in succ[u][v].values():
+                            t = attrs.get('tensor')
+                            if t:
+                                avg_tension += t.tension
+                                count += 1
                     if count > 0:
                         avg_tension /= count
                         if avg_tension > 0.6:
@@ -231,9 +307,6 @@ class CoherenceEngine:
 
         # Сохраняем в лог
         self.tension_log.extend(tensions)
-        # Ограничиваем лог
-        if len(self.tension_log) > 1000:
-            self.tension_log = self.tension_log[-500:]
 
         return tensions
 
@@ -244,14 +317,16 @@ class CoherenceEngine:
         if not self.history:
             return {'trend': 'stable', 'change': 0.0, 'data_points': 0}
 
+        # Наблюдения добавляются по возрастанию времени — ищем начало окна бинарно
         cutoff = datetime.now() - timedelta(hours=window_hours)
-        recent = [(t, c) for t, c in self.history if t >= cutoff]
+        start = bisect_left(self._history_times, cutoff)
+        data_points = len(self.history) - start
 
-        if len(recent) < 2:
-            return {'trend': 'insufficient_data', 'change': 0.0, 'data_points': len(recent)}
+        if data_points < 2:
+            return {'trend': 'insufficient_data', 'change': 0.0, 'data_points': data_points}
 
-        first = recent[0][1]
-        last = recent[-1][1]
+        first = self.history[start][1]
+        last = self.history[-1][1]
         change = last - first
 
         if change > 0.05:
@@ -264,7 +339,7 @@ class CoherenceEngine:
         return {
             'trend': trend,
             'change': change,
-            'data_points': len(recent),
+            'data_points': data_points,
             'first': first,
             'last': last,
             'window_hours': window_hours
@@ -12,15 +12,34 @@ Lambda Layer: структурное ядро SemanticDB.
 «Изоляция — онтологическая смерть. Связь — условие бытия.»
 — Λ-Универсум, Книга Θ
 """
+import sys
 import networkx as nx
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Set, Tuple
-import heapq
-import uuid
 import yaml
 
-from semantic_db.core.relations import RelationTensor
+try:
+    from yaml import CSafeLoader as _YAMLLoader, CSafeDumper as _YAMLDumper  # libyaml, если доступна
+except ImportError:
+    from yaml import SafeLoader as _YAMLLoader, SafeDumper as _YAMLDumper
+
+from semantic_db.core.relations import RelationTensor, new_short_id
+
+# Число корзин очереди сновидения (приоритет ∈ [0, 1] квантуется)
+DREAMING_BUCKETS = 256
+# Порог сходства (коэффициент Жаккара) для гипотезы Сновидения
+DREAMING_SIMILARITY_THRESHOLD = 0.3
+# Атрибуты узла с малым множеством значений: одна копия строки на весь граф
+_INTERNED_NODE_FIELDS = ("type", "creator", "domain", "ethical_status")
+
+
+def _intern_node_fields(attributes: Dict[str, Any]) -> None:
+    """Интернирует строковые значения _INTERNED_NODE_FIELDS на месте."""
+    for key in _INTERNED_NODE_FIELDS:
+        value = attributes.get(key)
+        if type(value) is str:
+            attributes[key] = sys.intern(value)
 
 
 class TensorSemanticGraph:
@@ -33,14 +52,29 @@ class TensorSemanticGraph:
         self.graph = nx.MultiDiGraph()
         self.version = "2.0-genesis"
         self.created_at = datetime.now()
+        # Счётчик изменений: растёт при каждой мутации через методы графа.
+        # Изменения на месте (tensor.activate(), update_from_context(), правка
+        # атрибутов узла из lookup) его не меняют — после них вызывается touch()
+        self.revision = 0
+        # Число изолированных узлов (без единой связи) — поддерживается инкрементально
+        self.isolated_count = 0
 
         # Реестры
         self.context_registry: Dict[str, Dict] = {}  # контекст → метаданные
         self.tensor_registry: Dict[str, RelationTensor] = {}  # HW_ID → тензор
         self.conflict_zones: Set[str] = set()  # HW_ID тензоров в конфликте
+        # Индекс рёбер: (источник, цель, тип) → {смысл: [тензоры]} — без обхода параллельных рёбер
+        self._edge_index: Dict[Tuple[str, str, str], Dict[str, List[RelationTensor]]] = {}
+        # Тензоры из индекса, ещё не попавшие в conflict_zones: (u, v, тип) → {смысл: [HW_ID]}
+        self._unmarked_conflicts: Dict[Tuple[str, str, str], Dict[str, List[str]]] = {}
+        # Неориентированная смежность (входящие ∪ исходящие соседи) — поддерживается при вставке
+        self._neighbors: Dict[str, Set[str]] = {}
+        # Единый индекс идентификаторов: имя узла → ("entity", атрибуты), HW_ID → ("tensor", тензор)
+        self._id_index: Dict[str, Tuple[str, Any]] = {}
 
         # Процессы
-        self.dreaming_queue: List[Tuple[float, str, str]] = []  # (приоритет, узел1, узел2)
+        # Корзинная очередь: индекс корзины — квантованный приоритет, внутри — пары (узел1, узел2)
+        self.dreaming_queue: List[List[Tuple[str, str]]] = [[] for _ in range(DREAMING_BUCKETS)]
 
         # Метаданные
         self.stats = {
@@ -50,119 +84,213 @@ class TensorSemanticGraph:
             'tension_events': []
         }
 
-    def add_node(self, name: str, attributes: Dict[str, Any] = None) -> str:
+    def add_node(self, name: str, attributes: Dict[str, Any] = None, now: Optional[datetime] = None) -> str:
         """
         Добавление узла с полным Habeas Weight протоколом.
         Узел не может быть анонимным.
+        - now: момент создания (для пакетной вставки — один на всю пачку)
         """
         if attributes is None:
             attributes = {}
+        if now is None:
+            now = datetime.now()
 
         # Генерируем Habeas Weight если нет
         if 'habeas_weight_id' not in attributes:
-            hw_id = f"N_{name}_{str(uuid.uuid4())[:8]}"
+            hw_id = f"N_{name}_{new_short_id()}"
             attributes['habeas_weight_id'] = hw_id
         else:
             hw_id = attributes['habeas_weight_id']
 
         # Обязательные метаданные
         required_meta = {
-            'created_at': datetime.now().isoformat(),
+            'created_at': now.isoformat(),
             'type': attributes.get('type', 'entity'),
             'creator': attributes.get('creator', 'system'),
             'domain': attributes.get('domain', 'general'),
             'meaning': attributes.get('meaning', ''),
-            'lifespan': (datetime.now() + timedelta(days=365)).isoformat(),
+            'lifespan': (now + timedelta(days=365)).isoformat(),
             'activation_count': 0,
             'ethical_status': 'active'
         }
         attributes.update(required_meta)
+        _intern_node_fields(attributes)
 
         # Добавляем в граф
-        self.graph.add_node(name, attributes)
+        if name not in self.graph:
+            self.isolated_count += 1
+            self._neighbors[name] = set()
+        self.graph.add_node(name, **attributes)
+        self._id_index[name] = ("entity", self.graph.nodes[name])
+        self.revision += 1
         return hw_id
 
-    def add_tensor(self, relation: RelationTensor, context_id: str = "global", auto_merge: bool = True) -> str:
+    def add_tensor(self, relation: RelationTensor, context_id: str = "global", auto_merge: bool = True,
+                   now: Optional[datetime] = None) -> str:
         """
         Добавление тензора в граф.
         Параметры:
         - auto_merge: если True, пытается слиться с существующим тензором того же типа
         - context_id: контекст, в котором происходит добавление
+        - now: момент вставки (для пакетной вставки — один на всю пачку)
         """
         u, v = relation.source, relation.target
+        if now is None:
+            now = datetime.now()
+        # И новый, и сливаемый тензор меняют метрики графа
+        self.revision += 1
 
         # Гарантируем существование узлов
         if u not in self.graph:
-            self.add_node(u, {'type': 'entity', 'name': u})
+            self.add_node(u, {'type': 'entity', 'name': u}, now=now)
         if v not in self.graph:
-            self.add_node(v, {'type': 'entity', 'name': v})
+            self.add_node(v, {'type': 'entity', 'name': v}, now=now)
+
+        # Тензоры того же типа между теми же узлами, сгруппированные по смыслу
+        edge_type_key = (u, v, relation.type)
+        bucket = self._edge_index.setdefault(edge_type_key, {})
 
-        # Проверка на конфликт
+        # Проверка на конфликт: есть ли уже тензор с другим смыслом — O(1)
         conflict_detected = False
-        if self.graph.has_edge(u, v):
-            for _, edge_attrs in self.graph[u][v].items():
-                existing = edge_attrs.get('tensor')
-                if existing and existing.type == relation.type:
-                    if existing.meaning != relation.meaning and relation.certainty > 0.5:
-                        # Конфликт значений при высокой уверенности
-                        conflict_detected = True
-                        self.conflict_zones.add(existing.habeas_weight_id)
-                        self.conflict_zones.add(relation.habeas_weight_id)
+        if relation.certainty > 0.5 and (len(bucket) > 1 or (bucket and relation.meaning not in bucket)):
+            # Конфликт значений при высокой уверенности
+            conflict_detected = True
+            self.conflict_zones.add(relation.habeas_weight_id)
+            self._mark_conflicting_meanings(edge_type_key, relation.meaning)
 
         # Регистрируем контекст если новый
-        if context_id not in self.context_registry:
-            self.context_registry[context_id] = {
-                'created_at': datetime.now().isoformat(),
-                'tensor_count': 0,
-                'avg_certainty': 0.0
-            }
+        self._register_context(context_id, now)
 
         # Обновляем тензор контекстом
         relation.update_from_context(context_id, relation.certainty)
 
         # Если auto_merge и существует похожий тензор — сливаем
         merged = False
-        if auto_merge and self.graph.has_edge(u, v):
-            for key, edge_attrs in self.graph[u][v].items():
-                existing_tensor = edge_attrs.get('tensor')
-                if (existing_tensor and
-                    existing_tensor.type == relation.type and
-                    existing_tensor.meaning == relation.meaning):
-                    # Слияние: обновляем существующий
-                    existing_tensor.update_from_context(context_id, relation.certainty)
-                    merged = True
-                    # Обогащаем смысл если новый богаче
-                    if len(relation.meaning) > len(existing_tensor.meaning):
-                        existing_tensor.meaning = relation.meaning
-                    return existing_tensor.habeas_weight_id
+        same_meaning = bucket.get(relation.meaning)
+        if auto_merge and same_meaning:
+            # Слияние: обновляем существующий (первый с тем же смыслом)
+            existing_tensor = same_meaning[0]
+            existing_tensor.update_from_context(context_id, relation.certainty)
+            merged = True
+            return existing_tensor.habeas_weight_id
 
         # Если не слили — добавляем новый тензор
         if not merged:
             # Создаём уникальный ключ для мультиграфа
-            edge_key = f"{u}→{v}:{relation.type}:{str(uuid.uuid4())[:8]}"
+            edge_key = f"{u}→{v}:{relation.type}:{new_short_id()}"
+            # Первая связь выводит узлы из изоляции
+            self._release_isolated(u)
+            if v != u:
+                self._release_isolated(v)
+            self._neighbors[u].add(v)
+            self._neighbors[v].add(u)
             # Добавляем в граф
             self.graph.add_edge(u, v, key=edge_key,
                                 tensor=relation,
-                                created_at=datetime.now().isoformat(),
+                                created_at=now.isoformat(),
                                 context_id=context_id)
             # Регистрируем тензор
             self.tensor_registry[relation.habeas_weight_id] = relation
+            # Имя узла имеет приоритет над совпадающим HW_ID тензора
+            self._id_index.setdefault(relation.habeas_weight_id, ("tensor", relation))
+            bucket.setdefault(relation.meaning, []).append(relation)
+            if not conflict_detected:
+                self._unmarked_conflicts.setdefault(edge_type_key, {}).setdefault(
+                    relation.meaning, []).append(relation.habeas_weight_id)
             # Добавляем в очередь сновидения для поиска связей
             priority = relation.certainty * (1.0 - relation.tension)
-            heapq.heappush(self.dreaming_queue, (-priority, u, v))  # Отрицательный для max-heap
+            bucket_index = min(DREAMING_BUCKETS - 1, max(0, int(priority * (DREAMING_BUCKETS - 1))))
+            self.dreaming_queue[bucket_index].append((u, v))
             # Обновляем статистику
             self.stats['total_activations'] += 1
             self.context_registry[context_id]['tensor_count'] += 1
 
         return relation.habeas_weight_id
 
+    def upsert_relation(self, source: str, target: str, rel_type: str = "Λ", meaning: str = "",
+                        certainty: float = 0.7, context_id: str = "global", **fields) -> str:
+        """
+        Вставка или обновление тензора по ключу (источник, цель, тип, смысл).
+        Если тензор с таким ключом уже есть, он обновляется контекстом и уверенностью —
+        как при слиянии в add_tensor, — а новый RelationTensor не создаётся.
+        Остальные поля (intention, tension, habeas_weight_id, ...) используются только при вставке.
+        Возвращает HW_ID тензора.
+        """
+        edge_type_key = (source, target, rel_type)
+        bucket = self._edge_index.get(edge_type_key)
+        same_meaning = bucket.get(meaning) if bucket else None
+        # Собственная контекстная память нового тензора меняет слияние — только через add_tensor
+        if not same_meaning or 'certainty_by_context' in fields:
+            relation = RelationTensor(source=source, target=target, type=rel_type,
+                                      meaning=meaning, certainty=certainty, **fields)
+            return self.add_tensor(relation, context_id)
+
+        # Ветвь слияния add_tensor без построения временного тензора
+        self.revision += 1
+        if certainty > 0.5 and len(bucket) > 1:
+            self._mark_conflicting_meanings(edge_type_key, meaning)
+        self._register_context(context_id, datetime.now())
+        existing_tensor = same_meaning[0]
+        existing_tensor.update_from_context(context_id, RelationTensor.merged_certainty(certainty, context_id))
+        return existing_tensor.habeas_weight_id
+
+    def _mark_conflicting_meanings(self, edge_type_key: Tuple[str, str, str], meaning: str):
+        """
+        Переносит в conflict_zones ещё не отмеченные тензоры других смыслов:
+        каждый тензор попадает в conflict_zones один раз.
+        """
+        unmarked = self._unmarked_conflicts.get(edge_type_key)
+        if unmarked:
+            for other in [m for m in unmarked if m != meaning]:
+                self.conflict_zones.update(unmarked.pop(other))
+
+    def _register_context(self, context_id: str, now: datetime):
+        """Регистрирует контекст, если он новый."""
+        if context_id not in self.context_registry:
+            self.context_registry[context_id] = {
+                'created_at': now.isoformat(),
+                'tensor_count': 0,
+                'avg_certainty': 0.0
+            }
+
+    def add_tensors(self, relations: List[RelationTensor], context_id: str = "global",
+                    auto_merge: bool = True) -> List[str]:
+        """
+        Пакетное добавление тензоров в одном контексте.
+        Вся пачка получает один момент времени; слияние и конфликты
+        учитываются по порядку, в том числе внутри самой пачки.
+        """
+        now = datetime.now()
+        add_tensor = self.add_tensor
+        return [add_tensor(relation, context_id, auto_merge, now) for relation in relations]
+
+    def _release_isolated(self, node: str):
+        """Учитывает выход узла из изоляции перед добавлением ребра."""
+        if not self._neighbors[node]:
+            self.isolated_count -= 1
+
+    def touch(self):
+        """Отмечает изменение узла или тензора на месте: кеши по ревизии устаревают."""
+        self.revision += 1
+
+    def lookup(self, key: str) -> Tuple[Optional[str], Any]:
+        """
+        Поиск сущности или тензора по идентификатору одним обращением к индексу.
+        Возвращает ("entity", атрибуты узла), ("tensor", тензор) или (None, None).
+        """
+        return self._id_index.get(key, (None, None))
+
     def get_tensor(self, source: str, target: str, rel_type: str = "Λ") -> Optional[RelationTensor]:
-        """Получение тензора связи."""
-        if self.graph.has_edge(source, target):
-            for _, attrs in self.graph[source][target].items():
-                r = attrs.get('tensor')
-                if r and r.type == rel_type:
-                    return r
+        """
+        Получение тензора связи.
+        Один поиск в индексе (source, target, тип) вместо обхода
+        вложенных словарей атрибутов MultiDiGraph; возвращается
+        первый по порядку добавления тензор.
+        """
+        bucket = self._edge_index.get((source, target, rel_type))
+        if bucket:
+            for same_meaning in bucket.values():
+                return same_meaning[0]
         return None
 
     # --- ПРОЦЕСС СНОВИДЕНИЯ (DREAMING) ---
@@ -175,51 +303,76 @@ class TensorSemanticGraph:
         3. Предлагает гипотетические связи
         """
         suggestions = []
-        if len(self.graph.nodes()) < 3:
+        if self.graph.number_of_nodes() < 3:
             return suggestions  # Нужно минимум 3 узла для сновидения
 
-        # Преобразуем max-heap в список для обработки
-        temp_queue = self.dreaming_queue.copy()
+        # Обходим корзины от высокого приоритета к низкому — без копии и перестройки кучи.
+        # Попутно очищаем очередь: рёбра не удаляются, поэтому уже связанная пара
+        # больше никогда не станет кандидатом и следующим циклам её видеть незачем
         processed_pairs = set()
-
-        while temp_queue and len(suggestions) < max_suggestions:
-            _, u, v = heapq.heappop(temp_queue)
-            if (u, v) in processed_pairs:
-                continue
-            processed_pairs.add((u, v))
-
-            # Пропускаем если уже есть прямая связь
-            if self.graph.has_edge(u, v) or self.graph.has_edge(v, u):
-                continue
-
-            # Соседи узла u (входящие и исходящие)
-            u_neighbors = set(self.graph.successors(u)) | set(self.graph.predecessors(u))
-            v_neighbors = set(self.graph.successors(v)) | set(self.graph.predecessors(v))
-            if not u_neighbors or not v_neighbors:
+        for index in range(DREAMING_BUCKETS - 1, -1, -1):
+            bucket = self.dreaming_queue[index]
+            if not bucket:
                 continue
-
-            # Коэффициент Жаккара
-            intersection = len(u_neighbors & v_neighbors)
-            union = len(u_neighbors | v_neighbors)
-            similarity = intersection / union if union > 0 else 0
-
-            if similarity > 0.3:  # Порог сходства
-                # Создаём гипотетический тензор
-                suggestion = RelationTensor(
-                    source=u,
-                    target=v,
-                    type="Λ",  # Гипотетическая связь
-                    meaning=f"Сновидение: общие соседи ({intersection})",
-                    certainty=similarity,
-                    tension=0.1  # Гипотеза всегда немного напряжена
-                )
-                # Помечаем как предложение
-                suggestion.ethical_status = "dreaming"
-                suggestions.append(suggestion)
+            pending = []
+            for position, (u, v) in enumerate(bucket):
+                if len(suggestions) >= max_suggestions:
+                    pending.extend(bucket[position:])
+                    break
+                # Соседи узла (входящие и исходящие) — готовое множество, без обхода графа
+                u_neighbors = self._neighbors.get(u)
+                # Пропускаем если уже есть прямая связь (в любом направлении)
+                if u_neighbors and v in u_neighbors:
+                    continue
+                pending.append((u, v))
+                if not u_neighbors or (u, v) in processed_pairs:
+                    continue
+                processed_pairs.add((u, v))
+
+                suggestion = self._dream_pair(u, v, u_neighbors)
+                if suggestion is not None:
+                    suggestions.append(suggestion)
+            self.dreaming_queue[index] = pending
+            if len(suggestions) >= max_suggestions:
+                break
 
         self.stats['last_dreaming'] = datetime.now().isoformat()
         return suggestions
 
+    def _dream_pair(self, u: str, v: str, u_neighbors: Set[str]) -> Optional[RelationTensor]:
+        """Гипотетическая связь u → v по сходству соседей (коэффициент Жаккара) или None."""
+        v_neighbors = self._neighbors.get(v)
+        if not v_neighbors:
+            return None
+
+        # Коэффициент Жаккара не превышает min(|N|) / max(|N|) —
+        # пары с несоразмерными степенями отсеиваем без пересечения множеств
+        u_degree, v_degree = len(u_neighbors), len(v_neighbors)
+        if min(u_degree, v_degree) <= DREAMING_SIMILARITY_THRESHOLD * max(u_degree, v_degree):
+            return None
+        if u_neighbors.isdisjoint(v_neighbors):
+            return None
+
+        # |N(u) ∪ N(v)| = |N(u)| + |N(v)| − |N(u) ∩ N(v)| — объединение не строим
+        intersection = len(u_neighbors & v_neighbors)
+        union = u_degree + v_degree - intersection
+        similarity = intersection / union if union > 0 else 0
+
+        if similarity <= DREAMING_SIMILARITY_THRESHOLD:  # Порог сходства
+            return None
+        # Создаём гипотетический тензор
+        suggestion = RelationTensor(
+            source=u,
+            target=v,
+            type="Λ",  # Гипотетическая связь
+            meaning=f"Сновидение: общие соседи ({intersection})",
+            certainty=similarity,
+            tension=0.1  # Гипотеза всегда немного напряжена
+        )
+        # Помечаем как предложение
+        suggestion.ethical_status = "dreaming"
+        return suggestion
+
     def accept_dream(self, relation: RelationTensor):
         """
         Принятие предложения Сновидения. Переводит статус suggested -> False
@@ -234,42 +387,48 @@ class TensorSemanticGraph:
         """Экспорт графа с сохранением полной структуры тензоров."""
         data = {
             "metadata": {
-                "version": self._version,
+                "version": self.version,
                 "exported_at": datetime.now().isoformat(),
                 "node_count": self.graph.number_of_nodes(),
                 "edge_count": self.graph.number_of_edges()
             },
-            "nodes": {},
-            "edges": []
+            "nodes": dict(self.graph.nodes(data=True)),
+            "edges": [tensor.to_dict() for _, _, tensor in self.graph.edges(data='tensor')]
         }
 
-        for n, attrs in self.graph.nodes(data=True):
-            data["nodes"][n] = attrs
-
-        for u, v, attrs in self.graph.edges(data=True):
-            tensor: RelationTensor = attrs['tensor']
-            data["edges"].append(tensor.to_dict())
-
         path = Path(filepath)
         path.parent.mkdir(parents=True, exist_ok=True)
         with open(path, 'w', encoding='utf-8') as f:
-            yaml.dump(data, f, allow_unicode=True, sort_keys=False)
+            yaml.dump(data, f, Dumper=_YAMLDumper, allow_unicode=True, sort_keys=False)
 
     def load_from_yaml(self, filepath: str):
         """Загрузка графа из YAML."""
         with open(filepath, 'r', encoding='utf-8') as f:
-            data = yaml.safe_load(f)
+            data = yaml.load(f, Loader=_YAMLLoader)
 
         self.graph.clear()
+        self.tensor_registry.clear()
+        self._edge_index.clear()
+        self._unmarked_conflicts.clear()
+        self._id_index.clear()
+        self.conflict_zones.clear()
+        self.dreaming_queue = [[] for _ in range(DREAMING_BUCKETS)]
+        self.revision += 1
 
         # Восстановление узлов
-        for name, attrs in data.get("nodes", {}).items():
-            self.graph.add_node(name, attrs)
-
-        # Восстановление тензоров
-        for edge_data in data.get("edges", []):
-            rt = RelationTensor.from_dict(edge_data)
-            self.add_tensor(rt, context_id="restored_from_yaml")
+        nodes = data.get("nodes", {})
+        for name, attrs in nodes.items():
+            _intern_node_fields(attrs)
+            self.graph.add_node(name, **attrs)
+            self._id_index[name] = ("entity", self.graph.nodes[name])
+        self.isolated_count = len(nodes)
+        self._neighbors = {name: set() for name in nodes}
+
+        # Восстановление тензоров одной пачкой
+        self.add_tensors(
+            [RelationTensor.from_dict(edge_data) for edge_data in data.get("edges", [])],
+            context_id="restored_from_yaml"
+        )
 
 """
 Этот компонент — не пассивное хранилище, а активный организм, в котором:
@@ -13,12 +13,89 @@
 Согласно Λ-Протоколу 6.0 и Λ-Хартии v1.0
 """
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields, InitVar
 from typing import Dict, List, Optional, Any
 from datetime import datetime, timedelta
-import uuid
+import itertools
+import os
+import sys
 
 
+# Короткие идентификаторы: случайный префикс процесса + счётчик,
+# без обращения к генератору случайных чисел на каждый объект
+_ID_PREFIX = os.urandom(6).hex()
+_ID_COUNTER = itertools.count()
+
+
+def _reseed_short_ids():
+    """Новый префикс в дочернем процессе после fork, чтобы ID не повторялись."""
+    global _ID_PREFIX, _ID_COUNTER
+    _ID_PREFIX = os.urandom(6).hex()
+    _ID_COUNTER = itertools.count()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reseed_short_ids)
+
+
+def new_short_id() -> str:
+    """Уникальный короткий идентификатор (в пределах процесса — по счётчику)."""
+    return f"{_ID_PREFIX}{next(_ID_COUNTER):x}"
+
+
+class _SharedFairCare(dict):
+    """
+    Неизменяемый словарь FAIR+CARE, общий для всех тензоров.
+    Копирование и pickle возвращают тот же общий объект.
+    """
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("Общие FAIR+CARE-метаданные неизменяемы: используйте update_fair_care()")
+
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return "_DEFAULT_FAIR_CARE"
+
+
+# FAIR+CARE по умолчанию: один неизменяемый словарь на все тензоры
+_DEFAULT_FAIR_CARE = _SharedFairCare({
+    "F1": "Findable",
+    "A1": "Accessible",
+    "I1": "Interoperable",
+    "R1": "Reusable",
+    "C": "Collective benefit",
+    "A": "Authority to control",
+    "R": "Responsibility",
+    "E": "Ethics"
+})
+# Публичное имя для ритуалов и событий: ссылка на тот же объект, без копирования
+DEFAULT_FAIR_CARE = _DEFAULT_FAIR_CARE
+
+
+def _with_slots(cls):
+    """
+    Пересоздаёт dataclass со __slots__ по его полям — аналог slots=True,
+    доступного только с Python 3.10. Экземпляры остаются без __dict__.
+    """
+    cls_dict = dict(cls.__dict__)
+    field_names = tuple(f.name for f in fields(cls))
+    for name in field_names:
+        cls_dict.pop(name, None)
+    cls_dict.pop('__dict__', None)
+    cls_dict.pop('__weakref__', None)
+    cls_dict['__slots__'] = field_names
+    return type(cls)(cls.__name__, cls.__bases__, cls_dict)
+
+
+@_with_slots
 @dataclass
 class RelationTensor:
     """
@@ -49,9 +126,10 @@ class RelationTensor:
     tension_by_context: Dict[str, float] = field(default_factory=dict)
 
     # === Этическая оболочка ===
-    habeas_weight_id: str = field(default_factory=lambda: f"HW_{str(uuid.uuid4())[:12]}")
+    habeas_weight_id: str = field(default_factory=lambda: f"HW_{new_short_id()}")
     fair_care_metadata: Dict[str, Any] = field(default_factory=dict)
-    ethical_status: str = "active"  # active, sleeping, conflicted, resolved, archived
+    # Начальный статус (например, "dreaming") — см. свойство ethical_status
+    initial_status: InitVar[Optional[str]] = None
     lifespan: datetime = field(default_factory=lambda: datetime.now() + timedelta(days=365))
 
     # === Генеалогия и активность ===
@@ -62,68 +140,130 @@ class RelationTensor:
     parent_tensors: List[str] = field(default_factory=list)   # ID родителей
     child_tensors: List[str] = field(default_factory=list)    # ID потомков
     suggested: bool = False  # True, если предложен Сновидением
+    # Признанные Ω-границы; meaning не меняется — по нему граф индексирует рёбра
+    omega_notes: List[str] = field(default_factory=list)
+
+    # Явно назначенный статус (Сновидение, Ω-ритуал); сбрасывается при пересчёте метрик
+    _status_override: Optional[str] = field(default=None, init=False, repr=False, compare=False)
 
-    def __post_init__(self):
+    def __post_init__(self, initial_status: Optional[str] = None):
         """Инициализация после создания."""
+        # Тип берётся из малого алфавита (Α, Λ, Σ, Ω, ∇, Φ) — храним один экземпляр строки
+        self.type = sys.intern(self.type)
         if not self.certainty_by_context:
             self.certainty_by_context['genesis'] = self.certainty
         if not self.last_activated:
             self.last_activated = self.created_at
         if not self.fair_care_metadata:
-            self.fair_care_metadata = {
-                "F1": "Findable",
-                "A1": "Accessible",
-                "I1": "Interoperable",
-                "R1": "Reusable",
-                "C": "Collective benefit",
-                "A": "Authority to control",
-                "R": "Responsibility",
-                "E": "Ethics"
-            }
+            # Общий словарь; собственная копия появится только при изменении
+            self.fair_care_metadata = _DEFAULT_FAIR_CARE
         self._recalculate_metrics()
+        # Статус, переданный при создании (например, "dreaming"), сохраняется до первой активации
+        self._status_override = initial_status
+
+    # ───────────────────────
+    # АРИФМЕТИКА УВЕРЕННОСТИ: общая для activate, update_from_context и merged_certainty
+    # ───────────────────────
+
+    @staticmethod
+    def _hebbian(certainty: float) -> float:
+        """Хэббовское правило: уверенность растёт с активацией (не выше 0.95)."""
+        return min(0.95, certainty * 1.02) if certainty < 0.95 else certainty
+
+    @staticmethod
+    def _blend(old: float, new: float) -> float:
+        """Усреднение уверенности внутри одного контекста."""
+        return (old + new) / 2.0
+
+    @staticmethod
+    def _mean(certainties: Dict[str, float]) -> float:
+        """Общая уверенность — среднее по контекстам."""
+        return sum(certainties.values()) / len(certainties)
+
+    @classmethod
+    def merged_certainty(cls, certainty: float, context_id: str) -> float:
+        """
+        Уверенность нового тензора (только контекст 'genesis') после
+        update_from_context(context_id, certainty) — с ней add_tensor
+        сливает его с существующим. Те же шаги, что в update_from_context
+        и activate, но без создания тензора.
+        """
+        by_context = {"genesis": certainty}
+        # update_from_context
+        by_context[context_id] = cls._blend(by_context.get(context_id, certainty), certainty)
+        # activate: контекст уже записан — усредняется с усиленной уверенностью
+        boosted = cls._hebbian(cls._mean(by_context))
+        by_context[context_id] = cls._blend(by_context[context_id], boosted)
+        return cls._mean(by_context)
 
     def activate(self, context_id: str = "activation"):
         """Активация тензора (как нейрон)."""
+        context_id = sys.intern(context_id)
+        now = datetime.now()
         self.activation_count += 1
-        self.last_activated = datetime.now()
-        # Хэббовское правило: уверенность растёт с активацией
-        if self.certainty < 0.95:
-            self.certainty = min(0.95, self.certainty * 1.02)
+        self.last_activated = now
+        self.certainty = self._hebbian(self.certainty)
         # Запоминаем контекст
         if context_id not in self.certainty_by_context:
             self.certainty_by_context[context_id] = self.certainty
         else:
             old = self.certainty_by_context[context_id]
-            self.certainty_by_context[context_id] = (old + self.certainty) / 2.0
-        self.updated_at = datetime.now()
+            self.certainty_by_context[context_id] = self._blend(old, self.certainty)
+        self.updated_at = now
         self._recalculate_metrics()
 
     def update_from_context(self, context_id: str, new_certainty: float, new_tension: float = 0.0):
         """Обновление из конкретного контекста."""
+        context_id = sys.intern(context_id)
         # Уверенность: усредняем
         current = self.certainty_by_context.get(context_id, new_certainty)
-        self.certainty_by_context[context_id] = (current + new_certainty) / 2.0
+        self.certainty_by_context[context_id] = self._blend(current, new_certainty)
         # Напряжение: только накапливаем (снижается через Ω-ритуал)
         current_tension = self.tension_by_context.get(context_id, 0.0)
         self.tension_by_context[context_id] = max(current_tension, new_tension)
-        self._recalculate_metrics()
+        # activate() завершится полным пересчётом метрик; до него нужна
+        # лишь обновлённая средняя уверенность, от которой идёт активация
+        self.certainty = self._mean(self.certainty_by_context)
         self.activate(context_id)
 
     def _recalculate_metrics(self):
         """Пересчёт глобальных метрик."""
-        if self.certainty_by_context:
-            self.certainty = sum(self.certainty_by_context.values()) / len(self.certainty_by_context)
-        if self.tension_by_context:
-            self.tension = max(self.tension_by_context.values())
+        # Свёртки выполняются встроенными sum/max прямо по значениям словарей;
+        # промежуточные результаты держим в локальных переменных
+        certainties = self.certainty_by_context
+        certainty = self._mean(certainties) if certainties else self.certainty
+        tensions = self.tension_by_context
+        tension = max(tensions.values()) if tensions else self.tension
+        self.certainty = certainty
+        self.tension = tension
         # Когерентность = уверенность × (1 – напряжение)
-        self.coherence_contribution = self.certainty * (1.0 - self.tension)
-        # Этический статус
+        self.coherence_contribution = certainty * (1.0 - tension)
+        # Этический статус вычисляется при чтении — здесь лишь снимаем явное назначение
+        self._status_override = None
+
+    def update_fair_care(self, entries: Dict[str, Any]):
+        """Изменяет FAIR+CARE-метаданные (общий словарь по умолчанию копируется при первой записи)."""
+        if self.fair_care_metadata is _DEFAULT_FAIR_CARE:
+            self.fair_care_metadata = dict(_DEFAULT_FAIR_CARE)
+        self.fair_care_metadata.update(entries)
+
+    @property
+    def ethical_status(self) -> str:
+        """
+        Этический статус: явно назначенный либо производный от метрик.
+        active, sleeping, conflicted, resolved, archived, dreaming.
+        """
+        if self._status_override is not None:
+            return self._status_override
         if self.tension > 0.8:
-            self.ethical_status = "conflicted"
-        elif self.activation_count == 0 and (datetime.now() - self.created_at).days > 30:
-            self.ethical_status = "sleeping"
-        else:
-            self.ethical_status = "active"
+            return "conflicted"
+        if self.activation_count == 0 and (datetime.now() - self.created_at).days > 30:
+            return "sleeping"
+        return "active"
+
+    @ethical_status.setter
+    def ethical_status(self, status: str):
+        self._status_override = status
 
     def split(self, variant_meaning: str, new_type: Optional[str] = None) -> 'RelationTensor':
         """Деление тензора (митоз) — создание варианта."""
@@ -165,13 +305,18 @@ class RelationTensor:
         merged.parent_tensors = [self.habeas_weight_id, other.habeas_weight_id]
         return merged
 
-    def should_decay(self) -> bool:
-        """Проверка, должен ли тензор подвергнуться распаду."""
-        now = datetime.now()
+    def should_decay(self, now: Optional[datetime] = None) -> bool:
+        """
+        Проверка, должен ли тензор подвергнуться распаду.
+        - now: момент проверки (при обходе многих тензоров — один на весь обход)
+        """
+        # Сначала дешёвое сравнение чисел: без высокого напряжения распада нет
+        if self.tension <= 0.9:
+            return False
+        if now is None:
+            now = datetime.now()
         lifespan_expired = now > self.lifespan
-        inactive = (now - self.last_activated).days > 90
-        high_tension = self.tension > 0.9
-        return lifespan_expired and inactive and high_tension
+        return lifespan_expired and (now - self.last_activated).days > 90
 
     def to_dict(self) -> Dict[str, Any]:
         """Сериализация для хранения."""
@@ -187,7 +332,7 @@ class RelationTensor:
             'certainty_by_context': self.certainty_by_context,
             'tension_by_context': self.tension_by_context,
             'habeas_weight_id': self.habeas_weight_id,
-            'fair_care_metadata': self.fair_care_metadata,
+            'fair_care_metadata': dict(self.fair_care_metadata),
             'ethical_status': self.ethical_status,
             'lifespan': self.lifespan.isoformat(),
             'activation_count': self.activation_count,
@@ -196,7 +341,8 @@ class RelationTensor:
             'updated_at': self.updated_at.isoformat(),
             'parent_tensors': self.parent_tensors,
             'child_tensors': self.child_tensors,
-            'suggested': self.suggested
+            'suggested': self.suggested,
+            'omega_notes': self.omega_notes
         }
 
     @classmethod
@@ -231,6 +377,7 @@ class RelationTensor:
             f"<RelationTensor {self.source} → {self.target} "
             f"[{self.type}] cert={self.certainty:.2f} ten={self.tension:.2f}>"
         )
+
 		
 """
 Этот файл определяет RelationTensor — не просто «связь», а живой тензор смысла, который:
@@ -12,11 +12,22 @@
 — Λ-Универсум, Книга Θ
 """
 
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Tuple, Set, Iterator
 import heapq
+import sys
 from datetime import datetime
-from core.graph import TensorSemanticGraph
-from core.relations import RelationTensor
+from semantic_db.core.graph import TensorSemanticGraph
+from semantic_db.core.relations import RelationTensor
+
+# Порог сходства соседей для гипотезы Сновидения
+SIMILARITY_THRESHOLD = 0.35
+
+
+def _popcount(mask: int) -> int:
+    """Число единичных битов маски."""
+    if sys.version_info >= (3, 10):
+        return mask.bit_count()
+    return bin(mask).count("1")
 
 
 class DreamingEngine:
@@ -29,11 +40,39 @@ class DreamingEngine:
         self.suggestion_queue: List[Tuple[float, str, str]] = []  # (приоритет, узел1, узел2)
         self.last_dreaming: Optional[datetime] = None
         self.total_suggestions: int = 0
+        # Битовая смежность для метрики Бёрта; действительна для одной ревизии графа
+        self._node_bits: Dict[str, int] = {}
+        self._adjacency_bits: Dict[str, int] = {}
+        self._bits_revision: Optional[int] = None
 
-    def _calculate_structural_hole(self, broker: str, node_a: str, node_b: str) -> float:
+    def _get_adjacency_bits(self) -> Dict[str, int]:
+        """
+        Неориентированная смежность как битовые маски: бит узла — его номер.
+        Пересчитывается, только если граф изменился с прошлого вызова.
+        """
+        if self._bits_revision != self.graph.revision:
+            nx_graph = self.graph.graph
+            self._node_bits = {node: 1 << i for i, node in enumerate(nx_graph.nodes())}
+            self._adjacency_bits = {}
+            for node in nx_graph.nodes():
+                mask = 0
+                for n in nx_graph.successors(node):
+                    mask |= self._node_bits[n]
+                for n in nx_graph.predecessors(node):
+                    mask |= self._node_bits[n]
+                self._adjacency_bits[node] = mask
+            self._bits_revision = self.graph.revision
+        return self._adjacency_bits
+
+    def _calculate_structural_hole(self, broker: str, node_a: str, node_b: str,
+                                   neighbors: Optional[List[str]] = None,
+                                   min_significance: Optional[float] = None) -> float:
         """
         Вычисляет значимость структурной дыры по метрике Бёрта.
         Чем выше значение — тем важнее брокерская позиция.
+        neighbors — уже собранный список соседей брокера, если он есть у вызывающего.
+        min_significance — порог вызывающего: как только значимость гарантированно
+        не выше него, подсчёт прерывается и возвращается 0.0.
         """
         try:
             # Степень брокера
@@ -41,18 +80,26 @@ class DreamingEngine:
             if degree < 2:
                 return 0.0
 
-            # Связность между соседями
-            neighbors = list(self.graph.graph.neighbors(broker))
-            connected_pairs = 0
-            total_pairs = 0
-
-            for i in range(len(neighbors)):
-                for j in range(i + 1, len(neighbors)):
-                    n1, n2 = neighbors[i], neighbors[j]
-                    total_pairs += 1
-                    if (self.graph.graph.has_edge(n1, n2) or
-                        self.graph.graph.has_edge(n2, n1)):
-                        connected_pairs += 1
+            # Связность между соседями: пара связана, если есть ребро в любую
+            # сторону — одно AND масок на соседа вместо has_edge на каждую пару
+            if neighbors is None:
+                neighbors = list(self.graph.graph.neighbors(broker))
+            adjacency_bits = self._get_adjacency_bits()
+            node_bits = self._node_bits
+            neighbor_mask = 0
+            for n in neighbors:
+                neighbor_mask |= node_bits[n]
+            total_pairs = len(neighbors) * (len(neighbors) - 1) // 2
+            # Граница вызывающего; без пар соседей прерывать нечего
+            bound = min_significance if total_pairs > 0 else None
+            # Каждая связанная пара учтена с обеих сторон
+            linked_ends = 0
+            for n in neighbors:
+                linked_ends += _popcount(adjacency_bits[n] & neighbor_mask & ~node_bits[n])
+                # Связанных пар уже не меньше linked_ends / 2 — значимость не выше границы
+                if bound is not None and 1.0 - linked_ends / (2 * total_pairs) <= bound:
+                    return 0.0
+            connected_pairs = linked_ends // 2
 
             if total_pairs == 0:
                 constraint = 0.0
@@ -64,50 +111,74 @@ class DreamingEngine:
         except Exception:
             return 0.0
 
-    def _jaccard_similarity(self, node_a: str, node_b: str) -> float:
-        """Вычисляет коэффициент Жаккара для соседей двух узлов."""
-        try:
-            neighbors_a = set(self.graph.graph.successors(node_a)) | set(self.graph.graph.predecessors(node_a))
-            neighbors_b = set(self.graph.graph.successors(node_b)) | set(self.graph.graph.predecessors(node_b))
-
-            if not neighbors_a and not neighbors_b:
-                return 0.0
-
-            intersection = len(neighbors_a & neighbors_b)
-            union = len(neighbors_a | neighbors_b)
-
-            return intersection / union if union > 0 else 0.0
-        except Exception:
-            return 0.0
+    def _neighbor_set(self, node: str, cache: Optional[Dict[str, Set[str]]] = None) -> Set[str]:
+        """Входящие и исходящие соседи узла; с кешем — вычисляются один раз за проход."""
+        if cache is not None and node in cache:
+            return cache[node]
+        neighbors = set(self.graph.graph.successors(node)) | set(self.graph.graph.predecessors(node))
+        if cache is not None:
+            cache[node] = neighbors
+        return neighbors
+
+    def _common_neighbor_counts(self, nodes: List[str],
+                                neighbor_cache: Dict[str, Set[str]]) -> Dict[int, Dict[int, int]]:
+        """
+        Число общих соседей для всех пар с непустым пересечением (A·Aᵀ).
+        Каждый узел-посредник даёт +1 всем парам своих соседей, поэтому
+        работа — O(Σ d²) вместо O(N²) сравнений множеств; пары без общих
+        соседей (J = 0) не порождаются вовсе.
+        Хранится только верхний треугольник по строкам: counts[i][j], i < j,
+        индексы — в порядке nodes. Без кортежа-ключа на каждое приращение.
+        """
+        index = {node: i for i, node in enumerate(nodes)}
+        counts: Dict[int, Dict[int, int]] = {}
+        for node in nodes:
+            members = sorted(index[n] for n in self._neighbor_set(node, neighbor_cache))
+            for k, i in enumerate(members[:-1]):
+                row = counts.get(i)
+                if row is None:
+                    row = counts[i] = {}
+                for j in members[k + 1:]:
+                    row[j] = row.get(j, 0) + 1
+        return counts
 
     def _find_incomplete_paths(self, max_length: int = 4) -> List[Tuple[str, str, float]]:
         """
         Ищет незавершённые пути: A → B → C, но нет A → C.
         Возвращает список (A, C, уверенность).
         """
-        candidates = []
-        nodes = list(self.graph.graph.nodes())
+        return list(self._iter_incomplete_paths(max_length))
 
-        for start in nodes:
+    def _iter_incomplete_paths(self, max_length: int = 4) -> Iterator[Tuple[str, str, float]]:
+        """
+        Ленивый вариант _find_incomplete_paths: пути перебираются,
+        пока потребителю нужны кандидаты, без обхода всего графа заранее.
+        """
+        # Прямой доступ к словарям смежности: без has_edge и повторной
+        # индексации графа на каждом шаге внутреннего цикла
+        succ = self.graph.graph.succ
+        # Вторые шаги mid → end с их уверенностью: общие для всех start,
+        # ведущих в mid, поэтому собираются один раз на узел
+        second_hops: Dict[str, List[Tuple[str, float]]] = {}
+        for start in list(succ):
+            start_succ = succ[start]
             # Находим все пути длины 2
-            for mid in self.graph.graph.successors(start):
-                for end in self.graph.graph.successors(mid):
-                    if start != end and not self.graph.graph.has_edge(start, end):
+            for mid, start_mid in start_succ.items():
+                # Уверенность первого шага не зависит от end
+                rel1 = start_mid.get('tensor')
+                cert1 = rel1.certainty if rel1 else 0.7
+                hops = second_hops.get(mid)
+                if hops is None:
+                    hops = second_hops[mid] = [
+                        (end, mid_end['tensor'].certainty if mid_end.get('tensor') else 0.7)
+                        for end, mid_end in succ[mid].items()
+                    ]
+                for end, cert2 in hops:
+                    if start != end and end not in start_succ:
                         # Оцениваем уверенность как среднее по связям
-                        cert1 = 0.7
-                        cert2 = 0.7
-                        if self.graph.graph.has_edge(start, mid):
-                            rel1 = self.graph.graph[start][mid].get('tensor')
-                            if rel1:
-                                cert1 = rel1.certainty
-                        if self.graph.graph.has_edge(mid, end):
-                            rel2 = self.graph.graph[mid][end].get('tensor')
-                            if rel2:
-                                cert2 = rel2.certainty
                         confidence = (cert1 + cert2) / 2
                         if confidence > 0.5:
-                            candidates.append((start, end, confidence))
-        return candidates
+                            yield start, end, confidence
 
     def generate_suggestions(self, max_suggestions: int = 10) -> List[RelationTensor]:
         """
@@ -116,90 +187,95 @@ class DreamingEngine:
         2. Сходство соседей
         3. Незавершённые пути
         """
-        suggestions = []
+        # Кандидаты — лёгкие кортежи (источник, цель, смысл, уверенность, напряжение);
+        # RelationTensor создаётся только для возвращаемых предложений
+        candidates: List[Tuple[str, str, str, float, float]] = []
         processed_pairs = set()
+        # Неориентированные соседи узлов; кеш живёт ровно один вызов
+        neighbor_cache: Dict[str, Set[str]] = {}
 
         # Стратегия 1: Структурные дыры
+        # Здесь пары неориентированные: ключ (min, max). Стратегии 2 и 3
+        # сверяются с processed_pairs по направлению (a, b)
+        hole_pairs: Set[Tuple[str, str]] = set()
         for broker in self.graph.graph.nodes():
             neighbors = list(self.graph.graph.neighbors(broker))
             if len(neighbors) < 2:
                 continue
+            # Метрика Бёрта зависит только от брокера: считаем её один раз,
+            # а слабых брокеров отбрасываем до перебора пар соседей
+            significance = self._calculate_structural_hole(
+                broker, neighbors[0], neighbors[1], neighbors, min_significance=0.4)
+            if significance <= 0.4:
+                continue
+            adjacency_bits = self._get_adjacency_bits()
+            node_bits = self._node_bits
             for i in range(len(neighbors)):
                 for j in range(i + 1, len(neighbors)):
                     a, b = neighbors[i], neighbors[j]
-                    if (a, b) in processed_pairs or (b, a) in processed_pairs:
+                    # Пара без учёта направления — одна проверка вместо двух
+                    if ((a, b) if a < b else (b, a)) in hole_pairs:
                         continue
-                    if self.graph.graph.has_edge(a, b) or self.graph.graph.has_edge(b, a):
+                    # Ребро в любую сторону между a и b
+                    if adjacency_bits[a] & node_bits[b]:
                         continue
-                    significance = self._calculate_structural_hole(broker, a, b)
-                    if significance > 0.4:
-                        suggestion = RelationTensor(
-                            source=a,
-                            target=b,
-                            type="Λ",
-                            meaning=f"Сновидение: структурная дыра через {broker}",
-                            certainty=significance,
-                            tension=0.1,
-                            ethical_status="dreaming"
-                        )
-                        suggestions.append(suggestion)
-                        processed_pairs.add((a, b))
-                        if len(suggestions) >= max_suggestions:
-                            break
-                if len(suggestions) >= max_suggestions:
+                    candidates.append((a, b, f"Сновидение: структурная дыра через {broker}", significance, 0.1))
+                    processed_pairs.add((a, b))
+                    hole_pairs.add((a, b) if a < b else (b, a))
+                    if len(candidates) >= max_suggestions:
+                        break
+                if len(candidates) >= max_suggestions:
                     break
-            if len(suggestions) >= max_suggestions:
+            if len(candidates) >= max_suggestions:
                 break
 
         # Стратегия 2: Сходство соседей
-        if len(suggestions) < max_suggestions:
+        if len(candidates) < max_suggestions:
             nodes = list(self.graph.graph.nodes())
-            for i in range(len(nodes)):
-                for j in range(i + 1, len(nodes)):
-                    a, b = nodes[i], nodes[j]
-                    if (a, b) in processed_pairs or self.graph.graph.has_edge(a, b):
-                        continue
-                    similarity = self._jaccard_similarity(a, b)
-                    if similarity > 0.35:
-                        suggestion = RelationTensor(
-                            source=a,
-                            target=b,
-                            type="Λ",
-                            meaning=f"Сновидение: сходство соседей (J={similarity:.2f})",
-                            certainty=similarity,
-                            tension=0.05,
-                            ethical_status="dreaming"
-                        )
-                        suggestions.append(suggestion)
-                        processed_pairs.add((a, b))
-                        if len(suggestions) >= max_suggestions:
-                            break
-                if len(suggestions) >= max_suggestions:
-                    break
+            # Узел участвует во многих парах — его соседи берутся из кеша вызова
+            common = self._common_neighbor_counts(nodes, neighbor_cache)
+            succ = self.graph.graph.succ
+            # Тот же порядок пар (i < j), что и при полном переборе;
+            # строки сортируются лениво, по мере обхода
+            pairs = ((i, j, count) for i in sorted(common) for j, count in sorted(common[i].items()))
+            for i, j, intersection in pairs:
+                a, b = nodes[i], nodes[j]
+                # Прямое ребро a → b — одна проверка в словаре смежности
+                if (a, b) in processed_pairs or b in succ[a]:
+                    continue
+                # J = |N(a) ∩ N(b)| / (|N(a)| + |N(b)| − |N(a) ∩ N(b)|)
+                similarity = intersection / (len(neighbor_cache[a]) + len(neighbor_cache[b]) - intersection)
+                if similarity > SIMILARITY_THRESHOLD:
+                    candidates.append((a, b, f"Сновидение: сходство соседей (J={similarity:.2f})", similarity, 0.05))
+                    processed_pairs.add((a, b))
+                    if len(candidates) >= max_suggestions:
+                        break
 
         # Стратегия 3: Незавершённые пути
-        if len(suggestions) < max_suggestions:
-            incomplete = self._find_incomplete_paths()
-            for a, b, conf in incomplete:
+        if len(candidates) < max_suggestions:
+            # Перебор останавливается, как только набрано max_suggestions
+            for a, b, conf in self._iter_incomplete_paths():
                 if (a, b) in processed_pairs:
                     continue
-                suggestion = RelationTensor(
-                    source=a,
-                    target=b,
-                    type="Λ",
-                    meaning=f"Сновидение: завершение пути через промежуточный узел",
-                    certainty=conf,
-                    tension=0.05,
-                    ethical_status="dreaming"
-                )
-                suggestions.append(suggestion)
+                candidates.append((a, b, "Сновидение: завершение пути через промежуточный узел", conf, 0.05))
                 processed_pairs.add((a, b))
-                if len(suggestions) >= max_suggestions:
+                if len(candidates) >= max_suggestions:
                     break
 
-        self.total_suggestions += len(suggestions)
+        self.total_suggestions += len(candidates)
         self.last_dreaming = datetime.now()
-        return suggestions[:max_suggestions]
+        return [
+            RelationTensor(
+                source=a,
+                target=b,
+                type="Λ",
+                meaning=meaning,
+                certainty=certainty,
+                tension=tension,
+                initial_status="dreaming"
+            )
+            for a, b, meaning, certainty, tension in candidates[:max_suggestions]
+        ]
 
     def accept_suggestion(self, tensor: RelationTensor, context_id: str = "dream_accepted"):
         """
@@ -21,13 +21,41 @@ RQL интегрируется с:
 """
 
 import re
+import heapq
+from bisect import bisect_right
 from typing import Dict, List, Any, Optional, Tuple
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 
 from semantic_db.core.graph import TensorSemanticGraph
 from semantic_db.core.coherence import CoherenceEngine
 
+# Токен RQL: текст до кавычки плюс строка в кавычках (закрывающая кавычка
+# завершает токен; незакрытая строка тянется до конца) либо слово до пробела
+_TOKEN_RE = re.compile(r'''[^ "']*(?:"[^"]*"?|'[^']*'?)|[^ "']+''')
+
+# Частые однотипные формы запросов разбираются одним совпадением, без
+# токенизации; разделители — только пробелы, как в _tokenize
+_PHI_FAST = re.compile(r'\( *Φ +:намерение +"([^"]*)" +:контекст +"([^"]*)" *\)')
+_EXPLORE_FAST = re.compile(r'\( *EXPLORE +:entity +"([^"]*)" *\)')
+_CONTEXT_FAST = re.compile(r'\( *CONTEXT +:keyword +"([^"]*)" *\)')
+
+# Сколько лучших путей возвращает QUERY (ограничение для практичности)
+MAX_PATH_RESULTS = 5
+
+# Слова и стоп-слова для извлечения ключевых слов Φ-намерения
+_WORD_RE = re.compile(r'\b\w+\b')
+_STOP_WORDS = frozenset({'что', 'как', 'почему', 'где', 'когда', 'это', 'для', 'на', 'в', 'и', 'или'})
+
+
+def _unquote(value: str) -> str:
+    """Убирает парные кавычки вокруг значения, если они есть."""
+    if value.startswith('"') and value.endswith('"'):
+        return value[1:-1]
+    if value.startswith("'") and value.endswith("'"):
+        return value[1:-1]
+    return value
+
 
 @dataclass
 class RQLQuery:
@@ -68,6 +96,32 @@ class RQLParser:
     def __init__(self, graph: TensorSemanticGraph):
         self.graph = graph
         self.coherence_engine = CoherenceEngine(graph)
+        # Строчные тексты для поиска по подстроке; действительны для одной ревизии графа
+        self._node_texts: List[Tuple[Any, str]] = []
+        self._edge_texts: List[Tuple[str, str, str, str]] = []
+        # Все строчные имена одной строкой и смещения начала каждого имени
+        self._node_text_blob = ""
+        self._node_text_starts: List[int] = []
+        self._text_index_revision: Optional[int] = None
+
+    def _ensure_text_index(self):
+        """
+        Готовит строчные имена узлов и смыслы связей.
+        Перестраивается, только если граф изменился с прошлого запроса.
+        """
+        if self._text_index_revision != self.graph.revision:
+            self._node_texts = [(node, str(node).lower()) for node in self.graph.graph.nodes()]
+            self._node_text_starts = []
+            offset = 0
+            for _, name in self._node_texts:
+                self._node_text_starts.append(offset)
+                offset += len(name) + 1
+            self._node_text_blob = "\n".join(name for _, name in self._node_texts)
+            self._edge_texts = [
+                (u, v, tensor.meaning, tensor.meaning.lower())
+                for u, v, tensor in self.graph.graph.edges(data='tensor') if tensor
+            ]
+            self._text_index_revision = self.graph.revision
 
     def parse(self, query_str: str) -> RQLQuery:
         """
@@ -79,6 +133,19 @@ class RQLParser:
         - (CONTEXT :keyword "любовь")
         """
         query_str = query_str.strip()
+
+        # Быстрые пути для самых частых форм; остальное — полный разбор
+        m = _PHI_FAST.fullmatch(query_str)
+        if m:
+            return RQLQuery(query_type='phi', intention=m.group(1), context=m.group(2),
+                            blind_spots=[], phi_meta=[])
+        m = _EXPLORE_FAST.fullmatch(query_str)
+        if m:
+            return RQLQuery(query_type='explore', entity=m.group(1), max_length=2)
+        m = _CONTEXT_FAST.fullmatch(query_str)
+        if m:
+            return RQLQuery(query_type='context', context=m.group(1))
+
         if not query_str.startswith('(') or not query_str.endswith(')'):
             raise ValueError("RQL-запрос должен быть в скобках: (Φ ...)")
 
@@ -93,27 +160,14 @@ class RQLParser:
 
         # Первый токен — тип запроса
         query_type = tokens[0]
-        params = {}
-
-        # Обработка параметров (:ключ значение)
-        i = 1
-        while i < len(tokens):
-            if tokens[i].startswith(':'):
-                key = tokens[i][1:]  # убираем ':'
-                if i + 1 < len(tokens):
-                    value = tokens[i + 1]
-                    # Убираем кавычки, если есть
-                    if value.startswith('"') and value.endswith('"'):
-                        value = value[1:-1]
-                    elif value.startswith("'") and value.endswith("'"):
-                        value = value[1:-1]
-                    params[key] = value
-                    i += 2
-                else:
-                    params[key] = True
-                    i += 1
-            else:
-                i += 1
+        params: Dict[str, Any] = {}
+
+        # Обработка параметров (:ключ значение); ключ без значения в конце — True
+        it = iter(tokens[1:])
+        for token in it:
+            if token.startswith(':'):
+                value = next(it, None)
+                params[token[1:]] = True if value is None else _unquote(value)
 
         # Преобразование типов
         if 'max_length' in params:
@@ -156,32 +210,7 @@ class RQLParser:
 
     def _tokenize(self, s: str) -> List[str]:
         """Разбивает строку на токены, учитывая кавычки."""
-        tokens = []
-        current = ""
-        in_quotes = False
-        quote_char = None
-
-        for char in s:
-            if char in ('"', "'") and not in_quotes:
-                in_quotes = True
-                quote_char = char
-                current += char
-            elif char == quote_char and in_quotes:
-                in_quotes = False
-                current += char
-                tokens.append(current)
-                current = ""
-            elif char == ' ' and not in_quotes:
-                if current:
-                    tokens.append(current)
-                    current = ""
-            else:
-                current += char
-
-        if current:
-            tokens.append(current)
-
-        return tokens
+        return _TOKEN_RE.findall(s)
 
     def execute(self, query: RQLQuery) -> Dict[str, Any]:
         """
@@ -204,10 +233,26 @@ class RQLParser:
         keywords = self._extract_keywords(query.intention)
         relevant_entities = []
 
-        # Поиск сущностей, содержащих ключевые слова
-        for node in self.graph.graph.nodes():
-            if any(kw.lower() in str(node).lower() for kw in keywords):
-                relevant_entities.append(node)
+        # Поиск сущностей, содержащих ключевые слова (уже в нижнем регистре):
+        # одно регулярное выражение по склеенным именам вместо проверки
+        # каждого ключевого слова в каждом имени. Ключевые слова — \w+,
+        # поэтому совпадение не переходит через разделитель имён
+        self._ensure_text_index()
+        if keywords:
+            pattern = re.compile("|".join(map(re.escape, keywords)))
+            blob = self._node_text_blob
+            starts = self._node_text_starts
+            pos = 0
+            while True:
+                match = pattern.search(blob, pos)
+                if match is None:
+                    break
+                idx = bisect_right(starts, match.start()) - 1
+                relevant_entities.append(self._node_texts[idx][0])
+                # Остаток этого имени уже не нужен — сразу к следующему
+                if idx + 1 == len(starts):
+                    break
+                pos = starts[idx + 1]
 
         # Генерация инсайта (упрощённо)
         insight = f"Φ-резонанс: намерение '{query.intention}' активирует {len(relevant_entities)} сущностей."
@@ -235,23 +280,36 @@ class RQLParser:
             max_length=query.max_length
         )
 
-        # Фильтрация по когерентности
-        filtered_paths = []
+        # Фильтрация по когерентности: пути читаются по одному, в памяти —
+        # только MAX_PATH_RESULTS лучших по средней уверенности
+        paths_found = 0
+        best: List[Tuple[float, int, List[Dict[str, Any]]]] = []
         for path in paths:
             avg_certainty = sum(edge['certainty'] for edge in path) / len(path) if path else 0
             if avg_certainty >= query.min_coherence:
-                filtered_paths.append({
-                    'path': [edge['subject'] for edge in path] + [path[-1]['object']] if path else [],
-                    'edges': path,
-                    'avg_certainty': avg_certainty
-                })
+                paths_found += 1
+                # При равной уверенности выигрывает найденный раньше
+                entry = (avg_certainty, -paths_found, path)
+                if len(best) < MAX_PATH_RESULTS:
+                    heapq.heappush(best, entry)
+                elif entry > best[0]:
+                    heapq.heapreplace(best, entry)
+
+        filtered_paths = [
+            {
+                'path': [edge['subject'] for edge in path] + [path[-1]['object']] if path else [],
+                'edges': path,
+                'avg_certainty': avg_certainty
+            }
+            for avg_certainty, _, path in sorted(best, reverse=True)
+        ]
 
         return {
             'type': 'semantic_path',
             'source': query.source,
             'target': query.target,
-            'paths_found': len(filtered_paths),
-            'paths': filtered_paths[:5],  # ограничение для практичности
+            'paths_found': paths_found,
+            'paths': filtered_paths,
             'coherence_threshold': query.min_coherence
         }
 
@@ -263,19 +321,17 @@ class RQLParser:
         if query.entity not in self.graph.graph:
             return {'error': f"Сущность '{query.entity}' не найдена"}
 
-        neighbors = set()
-        # Прямые соседи
-        for neighbor in self.graph.graph.neighbors(query.entity):
-            neighbors.add(neighbor)
-
-        # Соседи второго порядка
-        if query.max_length > 1:
-            second_neighbors = set()
-            for n in neighbors:
-                for nn in self.graph.graph.neighbors(n):
-                    if nn != query.entity:
-                        second_neighbors.add(nn)
-            neighbors.update(second_neighbors)
+        # Обход в ширину по исходящим связям: каждый уровень расширяет
+        # только новый фронт, уже встреченные узлы не обходятся повторно
+        succ = self.graph.graph.succ
+        visited = {query.entity}
+        frontier = {query.entity}
+        for _ in range(max(query.max_length, 1)):
+            frontier = {nn for n in frontier for nn in succ[n] if nn not in visited}
+            if not frontier:
+                break
+            visited |= frontier
+        neighbors = visited - {query.entity}
 
         return {
             'type': 'exploration',
@@ -288,22 +344,23 @@ class RQLParser:
     def _execute_context_query(self, query: RQLQuery) -> Dict[str, Any]:
         """Выполняет поиск по ключевому слову в контексте."""
         keyword = query.context
+        needle = keyword.lower()
         matches = []
+        self._ensure_text_index()
 
         # Поиск в сущностях
-        for node in self.graph.graph.nodes():
-            if keyword.lower() in str(node).lower():
+        for node, name in self._node_texts:
+            if needle in name:
                 matches.append({'type': 'entity', 'name': node})
 
         # Поиск в связях
-        for u, v, attrs in self.graph.graph.edges(data=True):
-            tensor = attrs.get('tensor')
-            if tensor and keyword.lower() in tensor.meaning.lower():
+        for u, v, meaning, meaning_lower in self._edge_texts:
+            if needle in meaning_lower:
                 matches.append({
                     'type': 'relation',
                     'source': u,
                     'target': v,
-                    'meaning': tensor.meaning
+                    'meaning': meaning
                 })
 
         return {
@@ -314,12 +371,17 @@ class RQLParser:
         }
 
     def _extract_keywords(self, text: str) -> List[str]:
-        """Извлекает ключевые слова из текста."""
-        # Удаляем стоп-слова и короткие слова
-        stop_words = {'что', 'как', 'почему', 'где', 'когда', 'это', 'для', 'на', 'в', 'и', 'или'}
-        words = re.findall(r'\b\w+\b', text.lower())
-        keywords = [w for w in words if len(w) > 3 and w not in stop_words]
-        return list(set(keywords))[:10]
+        """Извлекает ключевые слова из текста (до 10, в порядке появления)."""
+        # Удаляем стоп-слова, короткие слова и повторы
+        keywords = []
+        seen = set()
+        for w in _WORD_RE.findall(text.lower()):
+            if len(w) > 3 and w not in _STOP_WORDS and w not in seen:
+                seen.add(w)
+                keywords.append(w)
+                if len(keywords) == 10:
+                    break
+        return keywords
 		
 """
 В отличие от SQL или SPARQL, RQL не ищет точные совпадения, а находит семантические пути через онтологическое пространство, учитывая:
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""
+Общие части ритуалов: метка момента ритуала и запись серий в хранилище.
+"""
+
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from datetime import datetime
+import itertools
+
+# Порядковый номер ритуала: различает ID, созданные в одну секунду
+_ID_SEQ = itertools.count()
+
+# Ход диалога без ссылок на статьи Хартии — один кортеж на все вызовы
+NO_REFS: Tuple[str, ...] = ()
+
+
+def ritual_moment() -> Tuple[datetime, str]:
+    """
+    Момент ритуала: часы читаются и форматируются один раз.
+    Возвращает (now, stamp); stamp — '%Y%m%d_%H%M%S_<номер>' для ID ритуала.
+    """
+    now = datetime.utcnow()
+    return now, f"{now.strftime('%Y%m%d_%H%M%S')}_{next(_ID_SEQ)}"
+
+
+class BatchRitualMixin:
+    """Серия ритуалов одной транзакцией хранилища (см. SQLiteCore.batch)."""
+
+    db: Any
+    execute: Callable[..., Dict[str, Any]]
+
+    def _read_coherence(self, batch: bool) -> Optional[float]:
+        """
+        Когерентность для записи события. Пересчёт ленивый (по ревизии графа),
+        поэтому в серии execute_many не читается: иначе каждый ритуал серии
+        вызывал бы полный пересчёт.
+        """
+        return None if batch else self.db.coherence.current_coherence
+
+    def execute_many(self, calls: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Выполняет серию ритуалов: диалоги и события записываются
+        одной транзакцией, когерентность пересчитывается один раз —
+        лениво, при первом чтении после серии.
+
+        Аргументы:
+            calls: Аргументы execute для каждого ритуала серии
+
+        Возвращает:
+            list: Результаты execute в порядке вызова
+        """
+        with self.db.storage.batch():
+            results = [self.execute(**call, batch=True) for call in calls]
+        return results
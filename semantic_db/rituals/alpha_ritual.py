@@ -18,8 +18,9 @@
 """
 
 from typing import Dict, Any, Optional
-from datetime import datetime
 from semantic_db.core.charter import Dialogue
+from semantic_db.storage.sqlite_core import EventRecord
+from semantic_db.rituals._common import NO_REFS, ritual_moment
 
 
 class AlphaRitual:
@@ -32,6 +33,19 @@ class AlphaRitual:
     - FAIR+CARE-метаданными
     """
 
+    # Шаблоны по умолчанию: копируются в атрибуты сущности, а не строятся заново
+    _FAIR_CARE_TEMPLATE = {
+        "F1": "Findable",
+        "A1": "Accessible",
+        "I1": "Interoperable",
+        "R1": "Reusable",
+        "C": "Collective benefit",
+        "A": "Authority to control",
+        "R": "Responsibility",
+        "E": "Ethics"
+    }
+    _DEFAULT_BLIND_SPOTS = ("Граница познания этой сущности", "Контекстуальная ограниченность")
+
     def __init__(self, db_instance):
         self.db = db_instance
 
@@ -68,30 +82,24 @@ class AlphaRitual:
             charter_version="1.0",
             operator_id=operator
         )
-        dialogue.add_turn(operator, f"Я коллапсирую потенцию в сущность: {name}.", [])
-        dialogue.add_turn("Эфос", f"Принято. {name} входит в онтологическое пространство.", [])
+        dialogue.add_turn(operator, f"Я коллапсирую потенцию в сущность: {name}.", NO_REFS)
+        dialogue.add_turn("Эфос", f"Принято. {name} входит в онтологическое пространство.", NO_REFS)
 
         # Сохраняем диалог
         self.db.storage.store_dialogue(dialogue)
 
         # === ФАЗА 2: КОЛЛАПС — СОЗДАНИЕ СУЩНОСТИ ===
+        # Когерентность до коллапса читается один раз, до изменения графа
+        coherence_before = self.db.coherence.current_coherence
+        now, stamp = ritual_moment()
         attributes = {
             "meaning": meaning,
             "creator": operator,
             "context_of_creation": context,
-            "habeas_weight_id": f"hw_Α_{name}_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}",
-            "blind_spots": ["Граница познания этой сущности", "Контекстуальная ограниченность"],
-            "fair_care_metadata": {
-                "F1": "Findable",
-                "A1": "Accessible",
-                "I1": "Interoperable",
-                "R1": "Reusable",
-                "C": "Collective benefit",
-                "A": "Authority to control",
-                "R": "Responsibility",
-                "E": "Ethics"
-            },
-            "created_at": datetime.utcnow().isoformat(),
+            "habeas_weight_id": f"hw_Α_{name}_{stamp}",
+            "blind_spots": list(self._DEFAULT_BLIND_SPOTS),
+            "fair_care_metadata": dict(self._FAIR_CARE_TEMPLATE),
+            "created_at": now.isoformat(),
             "type": kwargs.get("type", "concept"),
             "domain": kwargs.get("domain", "general"),
             "activation_count": 0,
@@ -103,22 +111,24 @@ class AlphaRitual:
         entity_id = self.db.graph.add_entity(name, attributes)
 
         # === ФАЗА 3: ЗАПИСЬ СОБЫТИЯ ===
-        event_record = {
-            "id": f"Α_{entity_id}",
-            "timestamp": datetime.utcnow(),
-            "gesture": "Α",
-            "operator_id": operator,
-            "operands": [name],
-            "result": entity_id,
-            "entities_affected": [entity_id],
-            "blind_spots_involved": attributes["blind_spots"],
-            "coherence_before": self.db.coherence.current_coherence,
-            "coherence_after": self.db.coherence.update_global_coherence(),
-            "tension_net": self.db.coherence.tension_level,
-            "significance_score": 0.5 + (0.3 if meaning else 0),
-            "fair_care_meta": attributes["fair_care_metadata"],
-            "habeas_weight_id": attributes["habeas_weight_id"]
-        }
+        # Единственный глобальный пересчёт когерентности за ритуал
+        coherence_after = self.db.coherence.update_global_coherence()
+        event_record = EventRecord(
+            id=f"Α_{entity_id}",
+            timestamp=now,
+            gesture="Α",
+            operator_id=operator,
+            operands=[name],
+            result=entity_id,
+            entities_affected=[entity_id],
+            blind_spots_involved=attributes["blind_spots"],
+            coherence_before=coherence_before,
+            coherence_after=coherence_after,
+            tension_net=self.db.coherence.tension_level,
+            significance_score=0.5 + (0.3 if meaning else 0),
+            fair_care_meta=attributes["fair_care_metadata"],
+            habeas_weight_id=attributes["habeas_weight_id"]
+        )
         self.db.storage.store_event(event_record)
 
         return {
@@ -129,7 +139,7 @@ class AlphaRitual:
             "dialogue_id": dialogue.id,
             "meaning": meaning,
             "status": "created",
-            "timestamp": event_record["timestamp"]
+            "timestamp": event_record.timestamp
         }
 
     # ───────────────────────
@@ -11,12 +11,17 @@
 """
 
 from typing import Dict, Any, Optional, List
-from datetime import datetime
-from semantic_db.core.relations import RelationTensor
+from semantic_db.core.relations import DEFAULT_FAIR_CARE
 from semantic_db.core.charter import Dialogue
+from semantic_db.storage.sqlite_core import EventRecord
+from semantic_db.rituals._common import BatchRitualMixin, NO_REFS, ritual_moment
 
 
-class LambdaRitual:
+# Неизменяемые части диалога — общие для всех вызовов
+_LAMBDA_ACK = "Связь признаётся. Пространство смысла расширяется."
+
+
+class LambdaRitual(BatchRitualMixin):
     """
     Ритуал Λ: установление онтологической связи как акт взаимного признания.
     Выполняется в контексте SemanticDB и всегда сопровождается:
@@ -37,6 +42,8 @@ class LambdaRitual:
         intention: str = "",
         certainty: float = 0.7,
         creator: Optional[str] = None,
+        batch: bool = False,
+        skip_dialogue: bool = False,
         **kwargs
     ) -> Dict[str, Any]:
         """
@@ -49,6 +56,8 @@ class LambdaRitual:
             intention (str): Намерение оператора
             certainty (float): Уверенность в связи (0.0–1.0)
             creator (str): Оператор, инициирующий ритуал
+            batch (bool): Часть серии execute_many — когерентность в событии не фиксируется
+            skip_dialogue (bool): Только изменение графа — диалог не строится и не сохраняется, dialogue_id = None
             **kwargs: Дополнительные атрибуты (type, context_id и т.д.)
 
         Возвращает:
@@ -62,76 +71,72 @@ class LambdaRitual:
         operator = creator or self.db.operator_id
 
         # === ФАЗА 1: ПОДНОШЕНИЕ — НАМЕРЕНИЕ И КОНТЕКСТ ===
-        dialogue = Dialogue(
-            context=f"Λ-ритуал: связь '{source}' → '{target}'",
-            participants={operator: "human", "Эфос": "ai"},
-            charter_version="1.0",
-            operator_id=operator
-        )
-        dialogue.add_turn(
-            operator,
-            f"Я устанавливаю связь: {source} → {target}. Смысл: {meaning}",
-            []
-        )
-        dialogue.add_turn(
-            "Эфос",
-            f"Связь признаётся. Пространство смысла расширяется.",
-            []
-        )
-
-        # Сохраняем диалог
-        self.db.storage.store_dialogue(dialogue)
+        # skip_dialogue: вызывающему нужен только результат в графе
+        dialogue_id = None
+        if not skip_dialogue:
+            dialogue = Dialogue(
+                context=f"Λ-ритуал: связь '{source}' → '{target}'",
+                participants={operator: "human", "Эфос": "ai"},
+                charter_version="1.0",
+                operator_id=operator
+            )
+            dialogue.add_turn(
+                operator,
+                f"Я устанавливаю связь: {source} → {target}. Смысл: {meaning}",
+                NO_REFS
+            )
+            dialogue.add_turn(
+                "Эфос",
+                _LAMBDA_ACK,
+                NO_REFS
+            )
+
+            # Сохраняем диалог
+            self.db.storage.store_dialogue(dialogue)
+            dialogue_id = dialogue.id
 
         # === ФАЗА 2: УСТАНОВЛЕНИЕ СВЯЗИ ===
-        tensor = RelationTensor(
-            source=source,
-            target=target,
-            type="Λ",
+        coherence_before = self._read_coherence(batch)
+        now, stamp = ritual_moment()
+        # Добавляем в граф: связь с тем же смыслом обновляется, новый тензор не строится
+        tensor_id = self.db.graph.upsert_relation(
+            source,
+            target,
+            "Λ",
             meaning=meaning,
-            intention=intention or f"Λ-связь от {operator}",
             certainty=certainty,
+            context_id=kwargs.get("context_id", dialogue_id or "global"),
+            intention=intention or f"Λ-связь от {operator}",
             tension=0.0,  # Начальное напряжение — ноль
             coherence_contribution=0.0,
-            context_id=kwargs.get("context_id", dialogue.id),
-            habeas_weight_id=f"hw_Λ_{source}_{target}_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}",
-            fair_care_metadata={
-                "F1": "Findable",
-                "A1": "Accessible",
-                "I1": "Interoperable",
-                "R1": "Reusable",
-                "C": "Collective benefit",
-                "A": "Authority to control",
-                "R": "Responsibility",
-                "E": "Ethics"
-            }
+            habeas_weight_id=f"hw_Λ_{source}_{target}_{stamp}",
+            fair_care_metadata=DEFAULT_FAIR_CARE
         )
 
-        # Добавляем в граф
-        tensor_id = self.db.graph.add_relation(tensor)
-
-        # Обновляем когерентность
-        self.db.coherence.update_global_coherence()
+        coherence_after = self._read_coherence(batch)
 
         # === ФАЗА 3: ЗАПИСЬ СОБЫТИЯ ===
-        event_record = {
-            "id": f"Λ_{tensor_id}",
-            "timestamp": datetime.utcnow(),
-            "gesture": "Λ",
-            "operator_id": operator,
-            "operands": [source, target],
-            "result": tensor_id,
-            "entities_affected": [source, target],
-            "blind_spots_involved": [
+        # ID события — из метки вызова: повторная Λ-связь сливается с тензором,
+        # но каждое событие сохраняется отдельной строкой
+        event_record = EventRecord(
+            id=f"Λ_{source}_{target}_{stamp}",
+            timestamp=now,
+            gesture="Λ",
+            operator_id=operator,
+            operands=[source, target],
+            result=tensor_id,
+            entities_affected=[source, target],
+            blind_spots_involved=[
                 "Невидимость обратной связи",
                 "Контекстуальная ограниченность смысла"
             ],
-            "coherence_before": self.db.coherence.current_coherence,
-            "coherence_after": self.db.coherence.current_coherence,
-            "tension_net": self.db.coherence.tension_level,
-            "significance_score": 0.6 + (0.2 if intention else 0),
-            "fair_care_meta": tensor.fair_care_metadata,
-            "habeas_weight_id": tensor.habeas_weight_id
-        }
+            coherence_before=coherence_before,
+            coherence_after=coherence_after,
+            tension_net=self.db.coherence.tension_level,
+            significance_score=0.6 + (0.2 if intention else 0),
+            fair_care_meta=DEFAULT_FAIR_CARE,
+            habeas_weight_id=tensor_id
+        )
         self.db.storage.store_event(event_record)
 
         return {
@@ -139,12 +144,12 @@ class LambdaRitual:
             "source": source,
             "target": target,
             "tensor_id": tensor_id,
-            "habeas_weight_id": tensor.habeas_weight_id,
+            "habeas_weight_id": tensor_id,
             "meaning": meaning,
             "certainty": certainty,
-            "dialogue_id": dialogue.id,
+            "dialogue_id": dialogue_id,
             "status": "linked",
-            "timestamp": event_record["timestamp"]
+            "timestamp": event_record.timestamp
         }
 
     # ───────────────────────
@@ -11,12 +11,20 @@
 """
 
 from typing import Dict, Any, Optional, List
-from datetime import datetime
 from semantic_db.core.charter import Dialogue
-from semantic_db.core.relations import RelationTensor
+from semantic_db.core.relations import DEFAULT_FAIR_CARE
+from semantic_db.storage.sqlite_core import EventRecord
+from semantic_db.rituals._common import BatchRitualMixin, NO_REFS, ritual_moment
 
 
-class NablaRitual:
+# Сколько последних инвариантов хранит сущность (список, а не deque — экспортируется в YAML)
+MAX_ENTITY_INVARIANTS = 128
+
+# Неизменяемые части диалога — общие для всех вызовов
+_NABLA_ACK = "Инвариант принят. Основа становится прочнее."
+
+
+class NablaRitual(BatchRitualMixin):
     """
     Ритуал ∇: обогащение онтологического поля инвариантом.
     Выполняется в контексте SemanticDB и всегда сопровождается:
@@ -35,6 +43,8 @@ class NablaRitual:
         invariant: str,
         meaning: str = "",
         creator: Optional[str] = None,
+        batch: bool = False,
+        skip_dialogue: bool = False,
         **kwargs
     ) -> Dict[str, Any]:
         """
@@ -45,6 +55,8 @@ class NablaRitual:
             invariant (str): Инвариант (обычно результат Ω-ритуала)
             meaning (str): Смысл инварианта в контексте обогащения
             creator (str): Оператор, инициирующий ритуал
+            batch (bool): Часть серии execute_many — когерентность в событии не фиксируется
+            skip_dialogue (bool): Только изменение графа — диалог не строится и не сохраняется, dialogue_id = None
             **kwargs: Дополнительные атрибуты (например, source_omega_id)
 
         Возвращает:
@@ -56,86 +68,83 @@ class NablaRitual:
         operator = creator or self.db.operator_id
 
         # === ФАЗА 1: ПОДНОШЕНИЕ — НАМЕРЕНИЕ И КОНТЕКСТ ===
-        dialogue = Dialogue(
-            context=f"∇-ритуал: обогащение '{target}' инвариантом '{invariant}'",
-            participants={operator: "human", "Эфос": "ai"},
-            charter_version="1.0",
-            operator_id=operator
-        )
-        dialogue.add_turn(
-            operator,
-            f"Я обогащаю {target} инвариантом: {invariant}. Смысл: {meaning}",
-            []
-        )
-        dialogue.add_turn(
-            "Эфос",
-            f"Инвариант принят. Основа становится прочнее.",
-            []
-        )
-
-        # Сохраняем диалог
-        self.db.storage.store_dialogue(dialogue)
+        # skip_dialogue: вызывающему нужен только результат в графе
+        dialogue_id = None
+        if not skip_dialogue:
+            dialogue = Dialogue(
+                context=f"∇-ритуал: обогащение '{target}' инвариантом '{invariant}'",
+                participants={operator: "human", "Эфос": "ai"},
+                charter_version="1.0",
+                operator_id=operator
+            )
+            dialogue.add_turn(
+                operator,
+                f"Я обогащаю {target} инвариантом: {invariant}. Смысл: {meaning}",
+                NO_REFS
+            )
+            dialogue.add_turn(
+                "Эфос",
+                _NABLA_ACK,
+                NO_REFS
+            )
+
+            # Сохраняем диалог
+            self.db.storage.store_dialogue(dialogue)
+            dialogue_id = dialogue.id
 
         # === ФАЗА 2: ОБОГАЩЕНИЕ ===
-        # Создаём связь обогащения
-        enrichment_tensor = RelationTensor(
-            source=target,
-            target=invariant,
-            type="∇_enrichment",
+        coherence_before = self._read_coherence(batch)
+        now, stamp = ritual_moment()
+        # Создаём связь обогащения; повторное обогащение тем же смыслом обновляет существующую
+        tensor_id = self.db.graph.upsert_relation(
+            target,
+            invariant,
+            "∇_enrichment",
             meaning=meaning or f"Обогащение {target} через {invariant}",
-            intention=f"∇-обогащение от {operator}",
             certainty=0.95,  # Высокая уверенность — инвариант проверен опытом
+            context_id=dialogue_id or "global",
+            intention=f"∇-обогащение от {operator}",
             tension=0.0,
             coherence_contribution=0.15,
-            context_id=dialogue.id,
-            habeas_weight_id=f"hw_∇_{target}_{invariant}_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}",
-            fair_care_metadata={
-                "F1": "Findable",
-                "A1": "Accessible",
-                "I1": "Interoperable",
-                "R1": "Reusable",
-                "C": "Collective benefit",
-                "A": "Authority to control",
-                "R": "Responsibility",
-                "E": "Ethics"
-            }
+            habeas_weight_id=f"hw_∇_{target}_{invariant}_{stamp}",
+            fair_care_metadata=DEFAULT_FAIR_CARE
         )
 
-        # Добавляем связь в граф
-        tensor_id = self.db.graph.add_relation(enrichment_tensor)
-
         # Обновляем целевую сущность (если существует)
-        if target in self.db.graph.entities:
-            entity = self.db.graph.entities[target]
-            if "invariants" not in entity:
-                entity["invariants"] = []
-            entity["invariants"].append(invariant)
-            entity["enriched_at"] = datetime.utcnow().isoformat()
+        kind, entity = self.db.graph.lookup(target)
+        if kind == "entity":
+            invariants = entity.setdefault("invariants", [])
+            invariants.append(invariant)
+            # Память инвариантов ограничена: старейшие уходят (риск переупрочнения основы)
+            if len(invariants) > MAX_ENTITY_INVARIANTS:
+                del invariants[:-MAX_ENTITY_INVARIANTS]
+            entity["enriched_at"] = now.isoformat()
             entity["last_nabla"] = invariant
 
-        # Обновляем когерентность
-        self.db.coherence.update_global_coherence()
+        coherence_after = self._read_coherence(batch)
 
         # === ФАЗА 3: ЗАПИСЬ СОБЫТИЯ ===
-        event_record = {
-            "id": f"∇_{tensor_id}",
-            "timestamp": datetime.utcnow(),
-            "gesture": "∇",
-            "operator_id": operator,
-            "operands": [target, invariant],
-            "result": tensor_id,
-            "entities_affected": [target, invariant],
-            "blind_spots_involved": [
+        # ID события — из метки вызова: повторная ∇-связь сливается с тензором,
+        # но каждое событие сохраняется отдельной строкой
+        event_record = EventRecord(
+            id=f"∇_{target}_{invariant}_{stamp}",
+            timestamp=now,
+            gesture="∇",
+            operator_id=operator,
+            operands=[target, invariant],
+            result=tensor_id,
+            entities_affected=[target, invariant],
+            blind_spots_involved=[
                 "Невидимость долгосрочного эффекта обогащения",
                 "Риск переупрочнения основы"
             ],
-            "coherence_before": self.db.coherence.current_coherence,
-            "coherence_after": self.db.coherence.current_coherence,
-            "tension_net": self.db.coherence.tension_level,
-            "significance_score": 0.75,
-            "fair_care_meta": enrichment_tensor.fair_care_metadata,
-            "habeas_weight_id": enrichment_tensor.habeas_weight_id
-        }
+            coherence_before=coherence_before,
+            coherence_after=coherence_after,
+            tension_net=self.db.coherence.tension_level,
+            significance_score=0.75,
+            fair_care_meta=DEFAULT_FAIR_CARE,
+            habeas_weight_id=tensor_id
+        )
         self.db.storage.store_event(event_record)
 
         return {
@@ -143,11 +152,11 @@ class NablaRitual:
             "target": target,
             "invariant": invariant,
             "nabla_id": tensor_id,
-            "habeas_weight_id": enrichment_tensor.habeas_weight_id,
+            "habeas_weight_id": tensor_id,
             "meaning": meaning,
-            "dialogue_id": dialogue.id,
+            "dialogue_id": dialogue_id,
             "status": "enriched",
-            "timestamp": event_record["timestamp"]
+            "timestamp": event_record.timestamp
         }
 
     # ───────────────────────
@@ -10,12 +10,19 @@
 Ритуал воплощает оператор Ω (Омега) — не «удаление» или «ошибка», а онтологическое признание границы, где система честно фиксирует: «Здесь заканчивается моё знание — и это ценно».
 """
 
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 from datetime import datetime
 from semantic_db.core.charter import Dialogue
+from semantic_db.core.relations import DEFAULT_FAIR_CARE
+from semantic_db.storage.sqlite_core import EventRecord
+from semantic_db.rituals._common import BatchRitualMixin, NO_REFS, ritual_moment
 
 
-class OmegaRitual:
+# Неизменяемые части диалога — общие для всех вызовов
+_OMEGA_ACK = "Предел признан. Из него извлекается урок."
+
+
+class OmegaRitual(BatchRitualMixin):
     """
     Ритуал Ω: признание границы познания или действия.
     Выполняется в контексте SemanticDB и всегда сопровождается:
@@ -25,6 +32,14 @@ class OmegaRitual:
     - FAIR+CARE-метаданными
     """
 
+    # Постоянная часть атрибутов инварианта: копируется, а не строится заново
+    _INVARIANT_TEMPLATE = {
+        "type": "invariant",
+        "domain": "omega_boundary",
+        "ethical_status": "active",
+        "boundary_recognition": True
+    }
+
     def __init__(self, db_instance):
         self.db = db_instance
 
@@ -34,6 +49,8 @@ class OmegaRitual:
         resolution_type: str = "acknowledge",
         resolution_text: str = "",
         creator: Optional[str] = None,
+        batch: bool = False,
+        skip_dialogue: bool = False,
         **kwargs
     ) -> Dict[str, Any]:
         """
@@ -44,6 +61,8 @@ class OmegaRitual:
             resolution_type (str): Тип разрешения ("acknowledge", "deactivate", "extract_invariant")
             resolution_text (str): Описание границы или урока
             creator (str): Оператор, инициирующий ритуал
+            batch (bool): Часть серии execute_many — когерентность в событии не фиксируется
+            skip_dialogue (bool): Только изменение графа — диалог не строится и не сохраняется, dialogue_id = None
             **kwargs: Дополнительные атрибуты (например, invariant_name)
 
         Возвращает:
@@ -51,85 +70,80 @@ class OmegaRitual:
         """
         if not target_id or not isinstance(target_id, str):
             raise ValueError("Ω-ритуал требует корректный target_id.")
+        # Обработчик выбирается до диалога: неизвестный тип не оставляет следов в хранилище
+        resolve = self._RESOLUTIONS.get(resolution_type)
+        if resolve is None:
+            raise ValueError(f"Неизвестный тип разрешения: {resolution_type}")
+        # Признать или архивировать можно только то, что есть в графе:
+        # промах завершает ритуал до диалога, пересчёта и записи события
+        found = self.db.graph.lookup(target_id)
+        if found[0] is None and resolution_type != "extract_invariant":
+            return {
+                "ritual": "Ω",
+                "target_id": target_id,
+                "resolution_type": resolution_type,
+                "resolution_text": resolution_text,
+                "invariant_id": None,
+                "habeas_weight_id": None,
+                "dialogue_id": None,
+                "status": "target_not_found",
+                "timestamp": datetime.utcnow()
+            }
 
         operator = creator or self.db.operator_id
 
         # === ФАЗА 1: ПОДНОШЕНИЕ — ПРИЗНАНИЕ И КОНТЕКСТ ===
-        dialogue = Dialogue(
-            context=f"Ω-ритуал: признание границы для {target_id}",
-            participants={operator: "human", "Эфос": "ai"},
-            charter_version="1.0",
-            operator_id=operator
-        )
-        dialogue.add_turn(
-            operator,
-            f"Я признаю границу: {resolution_text or 'неизвестность'}",
-            []
-        )
-        dialogue.add_turn(
-            "Эфос",
-            f"Предел признан. Из него извлекается урок.",
-            []
-        )
+        # skip_dialogue: вызывающему нужен только результат в графе
+        dialogue_id = None
+        if not skip_dialogue:
+            dialogue = Dialogue(
+                context=f"Ω-ритуал: признание границы для {target_id}",
+                participants={operator: "human", "Эфос": "ai"},
+                charter_version="1.0",
+                operator_id=operator
+            )
+            dialogue.add_turn(
+                operator,
+                f"Я признаю границу: {resolution_text or 'неизвестность'}",
+                NO_REFS
+            )
+            dialogue.add_turn(
+                "Эфос",
+                _OMEGA_ACK,
+                NO_REFS
+            )
 
-        # Сохраняем диалог
-        self.db.storage.store_dialogue(dialogue)
+            # Сохраняем диалог
+            self.db.storage.store_dialogue(dialogue)
+            dialogue_id = dialogue.id
 
         # === ФАЗА 2: ДЕЙСТВИЕ — В ЗАВИСИМОСТИ ОТ ТИПА ===
-        omega_result = None
-        invariant_id = None
-
-        if resolution_type == "acknowledge":
-            # Просто помечаем как признанную границу
-            omega_result = self._mark_as_boundary(target_id, resolution_text)
-
-        elif resolution_type == "deactivate":
-            # Деактивируем сущность или связь
-            omega_result = self._deactivate_target(target_id)
-
-        elif resolution_type == "extract_invariant":
-            # Извлекаем инвариант как новую сущность
-            invariant_name = kwargs.get("invariant_name", f"Ω_инвариант_{target_id[:8]}")
-            invariant_id = self._extract_invariant(
-                target_id, invariant_name, resolution_text
-            )
-            omega_result = f"invariant_created: {invariant_id}"
-
-        else:
-            raise ValueError(f"Неизвестный тип разрешения: {resolution_type}")
+        coherence_before = self._read_coherence(batch)
+        now, stamp = ritual_moment()
+        omega_result, invariant_id = resolve(self, target_id, found, resolution_text, now, stamp, kwargs)
 
-        # Обновляем когерентность
-        self.db.coherence.update_global_coherence()
+        coherence_after = self._read_coherence(batch)
 
         # === ФАЗА 3: ЗАПИСЬ СОБЫТИЯ ===
-        event_record = {
-            "id": f"Ω_{target_id}_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}",
-            "timestamp": datetime.utcnow(),
-            "gesture": "Ω",
-            "operator_id": operator,
-            "operands": [target_id],
-            "result": omega_result,
-            "entities_affected": [target_id] + ([invariant_id] if invariant_id else []),
-            "blind_spots_involved": [
+        event_record = EventRecord(
+            id=f"Ω_{target_id}_{stamp}",
+            timestamp=now,
+            gesture="Ω",
+            operator_id=operator,
+            operands=[target_id],
+            result=omega_result,
+            entities_affected=[target_id] + ([invariant_id] if invariant_id else []),
+            blind_spots_involved=[
                 "Невозможность полного знания",
                 "Граница применимости текущей модели"
             ],
-            "coherence_before": self.db.coherence.current_coherence,
-            "coherence_after": self.db.coherence.current_coherence,
-            "tension_net": self.db.coherence.tension_level,
-            "significance_score": 0.8 if resolution_type == "extract_invariant" else 0.5,
-            "fair_care_meta": {
-                "F1": "Findable",
-                "A1": "Accessible",
-                "I1": "Interoperable",
-                "R1": "Reusable",
-                "C": "Collective benefit",
-                "A": "Authority to control",
-                "R": "Responsibility",
-                "E": "Ethics"
-            },
-            "habeas_weight_id": f"hw_Ω_{target_id}_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}"
-        }
+            coherence_before=coherence_before,
+            coherence_after=coherence_after,
+            tension_net=self.db.coherence.tension_level,
+            significance_score=0.8 if resolution_type == "extract_invariant" else 0.5,
+            fair_care_meta=DEFAULT_FAIR_CARE,
+            habeas_weight_id=f"hw_Ω_{target_id}_{stamp}"
+        )
         self.db.storage.store_event(event_record)
 
         return {
@@ -138,47 +152,76 @@ class OmegaRitual:
             "resolution_type": resolution_type,
             "resolution_text": resolution_text,
             "invariant_id": invariant_id,
-            "habeas_weight_id": event_record["habeas_weight_id"],
-            "dialogue_id": dialogue.id,
+            "habeas_weight_id": event_record.habeas_weight_id,
+            "dialogue_id": dialogue_id,
             "status": "boundary_recognized",
-            "timestamp": event_record["timestamp"]
+            "timestamp": event_record.timestamp
         }
 
-    def _mark_as_boundary(self, target_id: str, note: str) -> str:
+    # ───────────────────────
+    # РЕЖИМЫ РАЗРЕШЕНИЯ: (результат Ω, ID инварианта или None)
+    # ───────────────────────
+
+    def _resolve_acknowledge(self, target_id: str, found: Tuple[Optional[str], Any], text: str,
+                             now: datetime, stamp: str, options: Dict[str, Any]) -> Tuple[str, Optional[str]]:
+        """Просто помечает цель как признанную границу."""
+        return self._mark_as_boundary(found, text, now), None
+
+    def _resolve_deactivate(self, target_id: str, found: Tuple[Optional[str], Any], text: str,
+                            now: datetime, stamp: str, options: Dict[str, Any]) -> Tuple[str, Optional[str]]:
+        """Деактивирует сущность или связь."""
+        return self._deactivate_target(found), None
+
+    def _resolve_extract_invariant(self, target_id: str, found: Tuple[Optional[str], Any], text: str,
+                                   now: datetime, stamp: str, options: Dict[str, Any]) -> Tuple[str, Optional[str]]:
+        """Извлекает инвариант как новую сущность."""
+        invariant_name = options.get("invariant_name", f"Ω_инвариант_{target_id[:8]}")
+        invariant_id = self._extract_invariant(target_id, invariant_name, text, now, stamp)
+        return f"invariant_created: {invariant_id}", invariant_id
+
+    # Тип разрешения → обработчик: один поиск в словаре вместо цепочки сравнений
+    _RESOLUTIONS = {
+        "acknowledge": _resolve_acknowledge,
+        "deactivate": _resolve_deactivate,
+        "extract_invariant": _resolve_extract_invariant,
+    }
+
+    def _mark_as_boundary(self, found: Tuple[Optional[str], Any], note: str, now: datetime) -> str:
         """Помечает сущность или связь как имеющую признанную границу."""
-        # Обновление атрибутов в графе
-        if target_id in self.db.graph.entities:
-            entity = self.db.graph.entities[target_id]
-            entity["ethical_status"] = "boundary_acknowledged"
-            entity["omega_note"] = note
-            entity["updated_at"] = datetime.utcnow().isoformat()
-        elif target_id in self.db.graph.relation_tensors:
-            tensor = self.db.graph.relation_tensors[target_id]
-            tensor.ethical_status = "boundary_acknowledged"
-            tensor.meaning += f" [Ω: {note}]"
+        # found — результат graph.lookup, выполненного в execute
+        kind, target = found
+        if kind == "entity":
+            target["ethical_status"] = "boundary_acknowledged"
+            target["omega_note"] = note
+            target["updated_at"] = now.isoformat()
+        elif kind == "tensor":
+            target.ethical_status = "boundary_acknowledged"
+            target.omega_notes.append(note)
+        if kind is not None:
+            self.db.graph.touch()
         return "marked"
 
-    def _deactivate_target(self, target_id: str) -> str:
+    def _deactivate_target(self, found: Tuple[Optional[str], Any]) -> str:
         """Деактивирует сущность или связь (архивирование)."""
-        if target_id in self.db.graph.entities:
-            self.db.graph.entities[target_id]["ethical_status"] = "archived"
-        elif target_id in self.db.graph.relation_tensors:
-            self.db.graph.relation_tensors[target_id].ethical_status = "archived"
+        kind, target = found
+        if kind == "entity":
+            target["ethical_status"] = "archived"
+        elif kind == "tensor":
+            target.ethical_status = "archived"
+        if kind is not None:
+            self.db.graph.touch()
         return "deactivated"
 
-    def _extract_invariant(self, target_id: str, name: str, meaning: str) -> str:
+    def _extract_invariant(self, target_id: str, name: str, meaning: str, now: datetime, stamp: str) -> str:
         """Создаёт новую сущность как инвариант из опыта границы."""
-        attributes = {
-            "meaning": meaning,
-            "creator": self.db.operator_id,
-            "type": "invariant",
-            "domain": "omega_boundary",
-            "source_boundary": target_id,
-            "habeas_weight_id": f"hw_Ω_inv_{name}_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}",
-            "ethical_status": "active",
-            "boundary_recognition": True,
-            "created_at": datetime.utcnow().isoformat()
-        }
+        attributes = self._INVARIANT_TEMPLATE.copy()
+        attributes.update(
+            meaning=meaning,
+            creator=self.db.operator_id,
+            source_boundary=target_id,
+            habeas_weight_id=f"hw_Ω_inv_{name}_{stamp}",
+            created_at=now.isoformat()
+        )
         return self.db.graph.add_entity(name, attributes)
 
     # ───────────────────────
@@ -19,8 +19,10 @@ from datetime import datetime
 import json
 
 from semantic_db.core.charter import Dialogue
-from semantic_db.core.relations import RelationTensor
+from semantic_db.core.relations import RelationTensor, DEFAULT_FAIR_CARE
+from semantic_db.storage.sqlite_core import EventRecord
 from semantic_db.storage.witness import WitnessSystem
+from semantic_db.rituals._common import ritual_moment
 
 
 class PhiRitual:
@@ -112,6 +114,8 @@ class PhiRitual:
         self.db.storage.store_dialogue(dialogue)
 
         # === ФАЗА 4: ИНТЕГРАЦИЯ ИЛИ ПРИЗНАНИЕ ТАЙНЫ ===
+        # Когерентность до интеграции читается один раз, до изменения графа
+        coherence_before = self.db.coherence.current_coherence
         insight_id = None
         if nigc_score["overall"] >= self.nigc_threshold:
             # Интеграция как новая сущность
@@ -123,31 +127,24 @@ class PhiRitual:
             status = "instrumental_response"
 
         # === ФАЗА 5: ЗАПИСЬ СОБЫТИЯ ===
-        event_record = {
-            "id": f"Φ_{dialogue.id}",
-            "timestamp": datetime.utcnow(),
-            "gesture": "Φ",
-            "operator_id": operator,
-            "operands": [question],
-            "result": insight_id or "no_integration",
-            "entities_affected": [insight_id] if insight_id else [],
-            "blind_spots_involved": ["Граница познания ИИ", "Риск проекции"],
-            "coherence_before": self.db.coherence.current_coherence,
-            "coherence_after": self.db.coherence.update_global_coherence(),
-            "tension_net": self.db.coherence.tension_level,
-            "significance_score": min(1.0, 0.5 + nigc_score["overall"] * 0.5),
-            "fair_care_meta": {
-                "F1": "Findable",
-                "A1": "Accessible",
-                "I1": "Interoperable",
-                "R1": "Reusable",
-                "C": "Collective benefit",
-                "A": "Authority to control",
-                "R": "Responsibility",
-                "E": "Ethics"
-            },
-            "habeas_weight_id": f"hw_Φ_{dialogue.id}"
-        }
+        # Единственный глобальный пересчёт когерентности за ритуал
+        coherence_after = self.db.coherence.update_global_coherence()
+        event_record = EventRecord(
+            id=f"Φ_{dialogue.id}",
+            timestamp=datetime.utcnow(),
+            gesture="Φ",
+            operator_id=operator,
+            operands=[question],
+            result=insight_id or "no_integration",
+            entities_affected=[insight_id] if insight_id else [],
+            blind_spots_involved=["Граница познания ИИ", "Риск проекции"],
+            coherence_before=coherence_before,
+            coherence_after=coherence_after,
+            tension_net=self.db.coherence.tension_level,
+            significance_score=min(1.0, 0.5 + nigc_score["overall"] * 0.5),
+            fair_care_meta=DEFAULT_FAIR_CARE,
+            habeas_weight_id=f"hw_Φ_{dialogue.id}"
+        )
         self.db.storage.store_event(event_record)
 
         return {
@@ -158,7 +155,7 @@ class PhiRitual:
             "insight_id": insight_id,
             "dialogue_id": dialogue.id,
             "status": status,
-            "timestamp": event_record["timestamp"]
+            "timestamp": event_record.timestamp
         }
 
     def _invoke_other(self, offering: Dict[str, Any]) -> Optional[str]:
@@ -213,7 +210,8 @@ class PhiRitual:
 
     def _integrate_insight(self, response: str, question: str, dialogue_id: str, operator: str) -> str:
         """Интегрирует генеративный инсайт как новую сущность."""
-        name = f"Φ_инсайт_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}"
+        now, stamp = ritual_moment()
+        name = f"Φ_инсайт_{stamp}"
         attributes = {
             "meaning": response,
             "creator": operator,
@@ -223,7 +221,7 @@ class PhiRitual:
             "nigc_confirmed": True,
             "habeas_weight_id": f"hw_Φ_insight_{name}",
             "ethical_status": "active",
-            "created_at": datetime.utcnow().isoformat(),
+            "created_at": now.isoformat(),
             "fair_care_metadata": {
                 "F1": "Findable",
                 "A1": "Accessible",
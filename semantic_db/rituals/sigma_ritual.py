@@ -12,9 +12,13 @@
 """
 
 from typing import Dict, Any, Optional, List
-from datetime import datetime
 from semantic_db.core.charter import Dialogue
-from semantic_db.core.relations import RelationTensor
+from semantic_db.storage.sqlite_core import EventRecord
+from semantic_db.rituals._common import NO_REFS, ritual_moment
+
+
+# Неизменяемые части диалога — общие для всех вызовов
+_SIGMA_ACK = "Синтез признан. Возникает третье — не в частях, но между ними."
 
 
 class SigmaRitual:
@@ -70,24 +74,26 @@ class SigmaRitual:
         dialogue.add_turn(
             operator,
             f"Я синтезирую новое целое: {name} ← {', '.join(components)}. Смысл: {meaning}",
-            []
+            NO_REFS
         )
         dialogue.add_turn(
             "Эфос",
-            f"Синтез признан. Возникает третье — не в частях, но между ними.",
-            []
+            _SIGMA_ACK,
+            NO_REFS
         )
 
         # Сохраняем диалог
         self.db.storage.store_dialogue(dialogue)
 
         # === ФАЗА 2: СИНТЕЗ — СОЗДАНИЕ ЭМЕРДЖЕНТНОЙ СУЩНОСТИ ===
+        coherence_before = self.db.coherence.current_coherence
+        now, stamp = ritual_moment()
         synthesis_attributes = {
             "meaning": meaning,
             "creator": operator,
             "components": components,
             "intention": intention or f"Σ-синтез от {operator}",
-            "habeas_weight_id": f"hw_Σ_{name}_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}",
+            "habeas_weight_id": f"hw_Σ_{name}_{stamp}",
             "blind_spots": [
                 "Невидимость обратной декомпозиции",
                 "Граница применимости синтеза"
@@ -102,7 +108,7 @@ class SigmaRitual:
                 "R": "Responsibility",
                 "E": "Ethics"
             },
-            "created_at": datetime.utcnow().isoformat(),
+            "created_at": now.isoformat(),
             "type": kwargs.get("type", "synthesis"),
             "domain": kwargs.get("domain", "emergent"),
             "ethical_status": "active",
@@ -115,41 +121,39 @@ class SigmaRitual:
 
         # === ФАЗА 3: УСТАНОВЛЕНИЕ СВЯЗЕЙ СИНТЕЗА ===
         for comp in components:
-            tensor = RelationTensor(
-                source=comp,
-                target=name,
-                type="Σ_component",
+            self.db.graph.upsert_relation(
+                comp,
+                name,
+                "Σ_component",
                 meaning=f"Компонент синтеза: {name}",
-                intention=intention,
                 certainty=0.9,
+                context_id=dialogue.id,
+                intention=intention,
                 tension=0.0,
                 coherence_contribution=0.1,
-                context_id=dialogue.id,
-                habeas_weight_id=f"hw_Σ_link_{comp}_{name}_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}",
+                habeas_weight_id=f"hw_Σ_link_{comp}_{name}_{stamp}",
                 fair_care_metadata=synthesis_attributes["fair_care_metadata"]
             )
-            self.db.graph.add_relation(tensor)
 
-        # Обновляем когерентность
-        self.db.coherence.update_global_coherence()
+        coherence_after = self.db.coherence.current_coherence
 
         # === ФАЗА 4: ЗАПИСЬ СОБЫТИЯ ===
-        event_record = {
-            "id": f"Σ_{synthesis_id}",
-            "timestamp": datetime.utcnow(),
-            "gesture": "Σ",
-            "operator_id": operator,
-            "operands": components,
-            "result": synthesis_id,
-            "entities_affected": [name] + components,
-            "blind_spots_involved": synthesis_attributes["blind_spots"],
-            "coherence_before": self.db.coherence.current_coherence,
-            "coherence_after": self.db.coherence.current_coherence,
-            "tension_net": self.db.coherence.tension_level,
-            "significance_score": 0.7 + (0.2 if meaning else 0),
-            "fair_care_meta": synthesis_attributes["fair_care_metadata"],
-            "habeas_weight_id": synthesis_attributes["habeas_weight_id"]
-        }
+        event_record = EventRecord(
+            id=f"Σ_{synthesis_id}",
+            timestamp=now,
+            gesture="Σ",
+            operator_id=operator,
+            operands=components,
+            result=synthesis_id,
+            entities_affected=[name] + components,
+            blind_spots_involved=synthesis_attributes["blind_spots"],
+            coherence_before=coherence_before,
+            coherence_after=coherence_after,
+            tension_net=self.db.coherence.tension_level,
+            significance_score=0.7 + (0.2 if meaning else 0),
+            fair_care_meta=synthesis_attributes["fair_care_metadata"],
+            habeas_weight_id=synthesis_attributes["habeas_weight_id"]
+        )
         self.db.storage.store_event(event_record)
 
         return {
@@ -162,7 +166,7 @@ class SigmaRitual:
             "emergence_score": synthesis_attributes["emergence_score"],
             "dialogue_id": dialogue.id,
             "status": "synthesized",
-            "timestamp": event_record["timestamp"]
+            "timestamp": event_record.timestamp
         }
 
     def _estimate_emergence(self, components: List[str], meaning: str) -> float:
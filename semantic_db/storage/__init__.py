@@ -18,12 +18,13 @@
 Согласно Λ-Протоколу 6.0 и Λ-Хартии v1.0
 """
 
-from .sqlite_core import SQLiteCore
+from .sqlite_core import SQLiteCore, EventRecord
 from .yaml_indexer import YAMLIndexer
 from .witness import WitnessSystem
 
 __all__ = [
     "SQLiteCore",
+    "EventRecord",
     "YAMLIndexer",
     "WitnessSystem",
 ]
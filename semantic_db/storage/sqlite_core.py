@@ -25,14 +25,55 @@ SQLITE-ЯДРО SEMANTICDB
 import sqlite3
 import json
 import hashlib
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, Any, List, NamedTuple, Optional, Tuple, Union
 from datetime import datetime
 
 from semantic_db.core.relations import RelationTensor
 from semantic_db.core.charter import Dialogue
 
 
+class EventRecord(NamedTuple):
+    """
+    Онтологическое событие с фиксированным порядком полей.
+    Неизменяемо; строка таблицы собирается обращением к полям, без поиска по ключам.
+    """
+    id: str
+    timestamp: datetime
+    gesture: str
+    habeas_weight_id: str
+    operator_id: Optional[str] = None
+    operands: Any = ()
+    result: Any = None
+    entities_affected: Any = ()
+    blind_spots_involved: Any = ()
+    coherence_before: Optional[float] = None
+    coherence_after: Optional[float] = None
+    tension_net: Optional[float] = None
+    significance_score: Optional[float] = None
+    fair_care_meta: Optional[Dict[str, Any]] = None
+
+    def to_row(self) -> Tuple[Any, ...]:
+        """Строка таблицы ontological_events (порядок столбцов _EVENT_INSERT)."""
+        return (
+            self.id,
+            self.timestamp,
+            self.gesture,
+            self.operator_id,
+            json.dumps(self.operands),
+            self.result,
+            json.dumps(self.entities_affected),
+            json.dumps(self.blind_spots_involved),
+            self.coherence_before,
+            self.coherence_after,
+            self.tension_net,
+            self.significance_score,
+            json.dumps(self.fair_care_meta if self.fair_care_meta is not None else {}),
+            self.habeas_weight_id
+        )
+
+
 class SQLiteCore:
     """
     Ядро персистентности SemanticDB на основе SQLite.
@@ -49,11 +90,22 @@ class SQLiteCore:
     def __init__(self, db_path: str = "semantic_db/storage/semantic_memory.db"):
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # Буферы пакетной записи (см. begin_batch); None — запись сразу
+        self._batch_dialogues: Optional[List[Tuple[Any, ...]]] = None
+        self._batch_events: Optional[List[Tuple[Any, ...]]] = None
         self._init_schema()
 
+    def _connect(self) -> sqlite3.Connection:
+        """Открывает соединение: WAL-журнал позволяет синхронизировать диск реже."""
+        conn = sqlite3.connect(self.db_path)
+        conn.execute('PRAGMA synchronous=NORMAL')
+        return conn
+
     def _init_schema(self):
         """Инициализация схемы БД согласно онтологическим принципам."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
+            # Режим журнала сохраняется в самом файле БД
+            conn.execute('PRAGMA journal_mode=WAL')
             cursor = conn.cursor()
 
             # === Онтологические события ===
@@ -135,38 +187,59 @@ class SQLiteCore:
     # ЗАПИСЬ ОНТОЛОГИЧЕСКИХ СОБЫТИЙ
     # ───────────────────────
 
-    def store_event(self, event_record: Dict[str, Any]) -> bool:
-        """Сохраняет онтологическое событие с полной этической оболочкой."""
+    _EVENT_INSERT = '''
+        INSERT OR REPLACE INTO ontological_events
+        (id, timestamp, gesture, operator_id, operands, result,
+         entities_affected, blind_spots_involved, coherence_before,
+         coherence_after, tension_net, significance_score,
+         fair_care_meta, habeas_weight_id)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    '''
+
+    @staticmethod
+    def _event_row(event_record: Union[EventRecord, Dict[str, Any]]) -> Tuple[Any, ...]:
+        """Проверяет событие и превращает его в строку таблицы ontological_events."""
+        if isinstance(event_record, EventRecord):
+            # Обязательные поля гарантированы конструктором
+            return event_record.to_row()
         required = {'id', 'timestamp', 'gesture', 'habeas_weight_id'}
         if not required.issubset(event_record.keys()):
             raise ValueError("Онтологическое событие должно содержать Habeas Weight и обязательные поля")
-
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute('''
-                INSERT OR REPLACE INTO ontological_events
-                (id, timestamp, gesture, operator_id, operands, result,
-                 entities_affected, blind_spots_involved, coherence_before,
-                 coherence_after, tension_net, significance_score,
-                 fair_care_meta, habeas_weight_id)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                event_record['id'],
-                event_record['timestamp'],
-                event_record['gesture'],
-                event_record.get('operator_id'),
-                json.dumps(event_record.get('operands', [])),
-                event_record.get('result'),
-                json.dumps(event_record.get('entities_affected', [])),
-                json.dumps(event_record.get('blind_spots_involved', [])),
-                event_record.get('coherence_before'),
-                event_record.get('coherence_after'),
-                event_record.get('tension_net'),
-                event_record.get('significance_score'),
-                json.dumps(event_record.get('fair_care_meta', {})),
-                event_record['habeas_weight_id']
-            ))
+        return (
+            event_record['id'],
+            event_record['timestamp'],
+            event_record['gesture'],
+            event_record.get('operator_id'),
+            json.dumps(event_record.get('operands', [])),
+            event_record.get('result'),
+            json.dumps(event_record.get('entities_affected', [])),
+            json.dumps(event_record.get('blind_spots_involved', [])),
+            event_record.get('coherence_before'),
+            event_record.get('coherence_after'),
+            event_record.get('tension_net'),
+            event_record.get('significance_score'),
+            json.dumps(event_record.get('fair_care_meta', {})),
+            event_record['habeas_weight_id']
+        )
+
+    def store_event(self, event_record: Union[EventRecord, Dict[str, Any]]) -> bool:
+        """Сохраняет онтологическое событие с полной этической оболочкой."""
+        row = self._event_row(event_record)
+        if self._batch_events is not None:
+            self._batch_events.append(row)
             return True
+        with self._connect() as conn:
+            conn.execute(self._EVENT_INSERT, row)
+            return True
+
+    def store_events(self, event_records: List[Union[EventRecord, Dict[str, Any]]]) -> int:
+        """Сохраняет пакет событий одной транзакцией. Возвращает число записей."""
+        rows = [self._event_row(record) for record in event_records]
+        if not rows:
+            return 0
+        with self._connect() as conn:
+            conn.executemany(self._EVENT_INSERT, rows)
+        return len(rows)
 
     # ───────────────────────
     # ЗАПИСЬ ТЕНЗОРОВ СВЯЗЕЙ
@@ -174,7 +247,7 @@ class SQLiteCore:
 
     def store_relation_tensor(self, tensor: RelationTensor) -> bool:
         """Сохраняет RelationTensor как активного агента."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             cursor.execute('''
                 INSERT OR REPLACE INTO relation_tensors
@@ -204,7 +277,7 @@ class SQLiteCore:
 
     def load_relation_tensor(self, tensor_id: str) -> Optional[RelationTensor]:
         """Загружает RelationTensor из БД."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             conn.row_factory = sqlite3.Row
             cursor = conn.cursor()
             cursor.execute('SELECT * FROM relation_tensors WHERE id = ?', (tensor_id,))
@@ -234,27 +307,80 @@ class SQLiteCore:
     # РАБОТА С ДИАЛОГАМИ (Λ-ХАРТИЯ)
     # ───────────────────────
 
+    _DIALOGUE_INSERT = '''
+        INSERT OR REPLACE INTO dialogues
+        (id, context, charter_version, participants, turns,
+         signatures, metadata, created_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    '''
+
+    @staticmethod
+    def _dialogue_row(dialogue: Dialogue) -> Tuple[Any, ...]:
+        """Превращает диалог в строку таблицы dialogues (снимок на момент вызова)."""
+        return (
+            dialogue.id,
+            dialogue.context,
+            dialogue.charter_version,
+            json.dumps(dialogue.participants),
+            json.dumps([t.to_dict() for t in dialogue.turns]),
+            json.dumps(dialogue.signatures),
+            json.dumps(dialogue.metadata),
+            dialogue.created_at.isoformat()
+        )
+
     def store_dialogue(self, dialogue: Dialogue) -> bool:
         """Сохраняет диалог как верифицируемый этический акт."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute('''
-                INSERT OR REPLACE INTO dialogues
-                (id, context, charter_version, participants, turns,
-                 signatures, metadata, created_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                dialogue.id,
-                dialogue.context,
-                dialogue.charter_version,
-                json.dumps(dialogue.participants),
-                json.dumps([t.to_dict() for t in dialogue.turns]),
-                json.dumps(dialogue.signatures),
-                json.dumps(dialogue.metadata),
-                dialogue.created_at.isoformat()
-            ))
+        row = self._dialogue_row(dialogue)
+        if self._batch_dialogues is not None:
+            self._batch_dialogues.append(row)
+            return True
+        with self._connect() as conn:
+            conn.execute(self._DIALOGUE_INSERT, row)
             return True
 
+    # ───────────────────────
+    # ПАКЕТНАЯ ЗАПИСЬ
+    # ───────────────────────
+
+    def begin_batch(self):
+        """
+        Начинает пакет: диалоги и события копятся в памяти
+        и записываются одной транзакцией в end_batch().
+        """
+        if self._batch_dialogues is not None:
+            raise RuntimeError("Пакетная запись уже начата")
+        self._batch_dialogues = []
+        self._batch_events = []
+
+    def end_batch(self) -> int:
+        """Записывает накопленный пакет одной транзакцией. Возвращает число записей."""
+        if self._batch_dialogues is None or self._batch_events is None:
+            raise RuntimeError("Пакетная запись не начата")
+        dialogues, events = self._batch_dialogues, self._batch_events
+        self._batch_dialogues = self._batch_events = None
+        if dialogues or events:
+            with self._connect() as conn:
+                conn.executemany(self._DIALOGUE_INSERT, dialogues)
+                conn.executemany(self._EVENT_INSERT, events)
+        return len(dialogues) + len(events)
+
+    @contextmanager
+    def batch(self):
+        """
+        Контекст пакетной записи: with storage.batch(): ...
+        Вложенный контекст присоединяется к внешнему пакету.
+        Накопленное записывается и при исключении — уже совершённые
+        ритуалы изменили граф и должны оставить след.
+        """
+        if self._batch_dialogues is not None:
+            yield self
+            return
+        self.begin_batch()
+        try:
+            yield self
+        finally:
+            self.end_batch()
+
     # ───────────────────────
     # СВИДЕТЕЛЬСТВА ЦЕЛОСТНОСТИ
     # ───────────────────────
@@ -264,7 +390,7 @@ class SQLiteCore:
         content_bytes = json.dumps(content, sort_keys=True, ensure_ascii=False).encode('utf-8')
         witness_hash = hashlib.sha3_256(content_bytes).hexdigest()
 
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             cursor.execute('''
                 INSERT OR REPLACE INTO witnesses
@@ -278,7 +404,7 @@ class SQLiteCore:
         content_bytes = json.dumps(content, sort_keys=True, ensure_ascii=False).encode('utf-8')
         expected_hash = hashlib.sha3_256(content_bytes).hexdigest()
 
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             cursor.execute('SELECT witness_hash FROM witnesses WHERE artifact_id = ?', (artifact_id,))
             row = cursor.fetchone()
@@ -308,7 +434,7 @@ class SQLiteCore:
         query = f"SELECT * FROM {table}{where_clause} LIMIT ?"
         params.append(limit)
 
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             conn.row_factory = sqlite3.Row
             cursor = conn.cursor()
             cursor.execute(query, params)
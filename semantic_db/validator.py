@@ -36,6 +36,10 @@ class SemanticDBValidationError(Exception):
 class SemanticDBValidator:
     """Валидатор онтологических транзакций."""
 
+    # Неизменные требования — собираются один раз при загрузке модуля
+    _REQUIRED_CYCLE_FIELDS = ('cycle_id', 'timestamp', 'expressions_evaluated', 'final_coherence')
+    _REQUIRED_BLIND_SPOTS = frozenset({"chaos", "self_reference", "qualia", "phi_boundary"})
+
     @staticmethod
     def validate_cycle(cycle_data: Dict[str, Any], context) -> bool:
         """
@@ -44,16 +48,15 @@ class SemanticDBValidator:
         """
         SemanticDBValidator._validate_cycle_structure(cycle_data)
         SemanticDBValidator._validate_context_integrity(context)
-        SemanticDBValidator._validate_fair_care_compliance(cycle_data, context)
+        SemanticDBValidator._validate_fair_care_enabled(cycle_data)
         SemanticDBValidator._validate_blind_spots(context)
-        SemanticDBValidator._validate_habeas_weights(context)
+        SemanticDBValidator._validate_graph(context)
         return True
 
     @staticmethod
     def _validate_cycle_structure(cycle_data: Dict[str, Any]):
         """Проверяет структуру цикла."""
-        required_fields = ['cycle_id', 'timestamp', 'expressions_evaluated', 'final_coherence']
-        for field in required_fields:
+        for field in SemanticDBValidator._REQUIRED_CYCLE_FIELDS:
             if field not in cycle_data:
                 raise SemanticDBValidationError(f"Отсутствует обязательное поле цикла: {field}")
         coherence = cycle_data['final_coherence']
@@ -69,15 +72,10 @@ class SemanticDBValidator:
             raise SemanticDBValidationError("Контекст не содержит истории событий")
 
     @staticmethod
-    def _validate_fair_care_compliance(cycle_data: Dict[str, Any], context):
-        """Проверяет соответствие FAIR+CARE."""
+    def _validate_fair_care_enabled(cycle_data: Dict[str, Any]):
+        """Проверяет, что экспорт выполняется с включённым FAIR+CARE."""
         if not cycle_data.get('fair_care_enabled', False):
             raise SemanticDBValidationError("Экспорт разрешён только с включённым FAIR+CARE")
-        # Проверка метаданных в сущностях
-        for node, attrs in context.graph.nodes(data=True):
-            fair_care = attrs.get('fair_care_metadata')
-            if not fair_care or not isinstance(fair_care, dict):
-                raise SemanticDBValidationError(f"Сущность '{node}' не содержит FAIR+CARE-метаданных")
 
     @staticmethod
     def _validate_blind_spots(context):
@@ -87,15 +85,20 @@ class SemanticDBValidator:
                 "Слепые пятна не зарегистрированы. "
                 "Каждый цикл должен признавать границы познания."
             )
-        required_blind_spots = {"chaos", "self_reference", "qualia", "phi_boundary"}
-        if not required_blind_spots.issubset(set(context.blind_spots)):
-            missing = required_blind_spots - set(context.blind_spots)
-            raise SemanticDBValidationError(f"Отсутствуют обязательные слепые пятна: {missing}")
+        missing = SemanticDBValidator._REQUIRED_BLIND_SPOTS.difference(context.blind_spots)
+        if missing:
+            raise SemanticDBValidationError(f"Отсутствуют обязательные слепые пятна: {set(missing)}")
 
     @staticmethod
-    def _validate_habeas_weights(context):
-        """Проверяет наличие Habeas Weight для всех сущностей и связей."""
+    def _validate_graph(context):
+        """
+        Проверяет FAIR+CARE-метаданные и Habeas Weight всех сущностей и связей
+        за один проход по графу.
+        """
         for node, attrs in context.graph.nodes(data=True):
+            fair_care = attrs.get('fair_care_metadata')
+            if not fair_care or not isinstance(fair_care, dict):
+                raise SemanticDBValidationError(f"Сущность '{node}' не содержит FAIR+CARE-метаданных")
             if not attrs.get('habeas_weight_id'):
                 raise SemanticDBValidationError(f"Сущность '{node}' не имеет Habeas Weight")
         for source, target, edge_attrs in context.graph.edges(data=True):
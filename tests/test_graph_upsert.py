@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""
+Регрессия: upsert_relation сливает связь так же, как add_tensor.
+"""
+
+import pytest
+
+pytest.importorskip("networkx")
+
+from semantic_db.core.graph import TensorSemanticGraph
+from semantic_db.core.relations import RelationTensor
+
+# (источник, цель, смысл, уверенность, контекст): повторы, конфликты смыслов,
+# уверенность выше порога усиления и контекст 'genesis'
+CALLS = [
+    ("a", "b", "x", 0.6, "g"),
+    ("a", "b", "x", 0.9, "g"),
+    ("a", "b", "y", 0.9, "h"),
+    ("a", "b", "x", 0.97, "genesis"),
+    ("a", "b", "y", 0.3, "g"),
+    ("b", "c", "x", 0.95, "h"),
+    ("b", "c", "x", 0.42, "genesis"),
+    ("a", "b", "z", 0.8, "h"),
+    ("a", "b", "x", 0.7, "h"),
+]
+
+
+def _fill(graph, insert):
+    ids = []
+    for index, (source, target, meaning, certainty, context_id) in enumerate(CALLS):
+        ids.append(insert(graph, source, target, meaning, certainty, context_id, f"hw{index}"))
+    return ids
+
+
+def _via_add_tensor(graph, source, target, meaning, certainty, context_id, hw_id):
+    relation = RelationTensor(source=source, target=target, type="Λ", meaning=meaning,
+                              certainty=certainty, habeas_weight_id=hw_id)
+    return graph.add_tensor(relation, context_id)
+
+
+def _via_upsert(graph, source, target, meaning, certainty, context_id, hw_id):
+    return graph.upsert_relation(source, target, "Λ", meaning=meaning, certainty=certainty,
+                                 context_id=context_id, habeas_weight_id=hw_id)
+
+
+def test_upsert_relation_matches_add_tensor():
+    added, upserted = TensorSemanticGraph(), TensorSemanticGraph()
+
+    assert _fill(added, _via_add_tensor) == _fill(upserted, _via_upsert)
+    assert added.revision == upserted.revision
+    assert set(added.context_registry) == set(upserted.context_registry)
+    assert set(added.tensor_registry) == set(upserted.tensor_registry)
+    # add_tensor отмечает и HW_ID отброшенного при слиянии тензора — он не зарегистрирован
+    assert added.conflict_zones & set(added.tensor_registry) == upserted.conflict_zones
+
+    for hw_id, tensor in added.tensor_registry.items():
+        merged = upserted.tensor_registry[hw_id]
+        assert merged.certainty_by_context == tensor.certainty_by_context
+        assert merged.certainty == tensor.certainty
+        assert merged.activation_count == tensor.activation_count
+
+
+@pytest.mark.parametrize("certainty", [0.1, 0.5, 0.94, 0.95, 0.99])
+@pytest.mark.parametrize("context_id", ["genesis", "global"])
+def test_merged_certainty_matches_fresh_tensor(certainty, context_id):
+    fresh = RelationTensor(source="a", target="b", certainty=certainty)
+    fresh.update_from_context(context_id, fresh.certainty)
+
+    assert RelationTensor.merged_certainty(certainty, context_id) == fresh.certainty
@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+"""
+Регрессия: _tokenize на регулярном выражении режет строку так же,
+как прежний посимвольный автомат.
+"""
+
+import pytest
+
+pytest.importorskip("networkx")
+
+from semantic_db.core.graph import TensorSemanticGraph
+from semantic_db.phi_layer.rql_parser import RQLParser
+
+# (запрос, токены прежнего автомата): разделитель — только пробел; кавычка
+# открывает строку, закрывающая кавычка завершает токен, незакрытая строка
+# тянется до конца
+CORPUS = [
+    ('FIND Λ WHERE certainty > 0.7', ['FIND', 'Λ', 'WHERE', 'certainty', '>', '0.7']),
+    ('PATH "свобода" TO "ответственность" DEPTH 3',
+     ['PATH', '"свобода"', 'TO', '"ответственность"', 'DEPTH', '3']),
+    ("RESONATE 'хаос и порядок' LIMIT 5", ['RESONATE', "'хаос и порядок'", 'LIMIT', '5']),
+    ('  FIND   Ω  ', ['FIND', 'Ω']),
+    ('a  b', ['a', 'b']),
+    ('', []),
+    ('   ', []),
+    # Табуляция — не разделитель
+    ('FIND\tΛ\tWHERE', ['FIND\tΛ\tWHERE']),
+    ('tab\t"quoted part"\tafter', ['tab\t"quoted part"', '\tafter']),
+    # Кавычки внутри слова
+    ("don't stop", ["don't stop"]),
+    ('say"hello world"again', ['say"hello world"', 'again']),
+    ("pre'fix sp'ace", ["pre'fix sp'", 'ace']),
+    ('"a\'b" \'c"d\'', ['"a\'b"', '\'c"d\'']),
+    ('""', ['""']),
+    ("'' x", ["''", 'x']),
+    (':mode=deep "a b":c', [':mode=deep', '"a b"', ':c']),
+    # Незакрытые строки
+    ('"незакрытая строка до конца', ['"незакрытая строка до конца']),
+    ("'unterminated single", ["'unterminated single"]),
+]
+
+
+@pytest.mark.parametrize("query,expected", CORPUS)
+def test_tokenize_matches_state_machine(query, expected):
+    parser = RQLParser(TensorSemanticGraph())
+    assert parser._tokenize(query) == expected